@@ -0,0 +1,184 @@
+from pathlib import Path
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+import pandas as pd
+
+# === 路径 ===
+ROOT = Path(__file__).resolve().parent
+SRC = ROOT / "src"
+CASES_ROOT = ROOT / "DRTS_Project-Test-Cases"
+BENCH_ROOT = ROOT / "output" / "bench"
+
+sys.path.insert(0, str(SRC))
+import pipeline  # noqa: E402
+import taskgen   # noqa: E402
+from main import natural_key  # noqa: E402
+
+"""benchmark.py — 性能基准
+--------------------------------------------------
+对官方 case 与 taskgen.py 生成的合成 case 逐个运行 pipeline.run_case，
+记录每个阶段 (preprocess / analyze / half_half / simulate 或 rta / check) 的耗时，
+重复 --repeat 次取中位数，结果写成 JSON，便于跨版本比较吞吐量：
+    python benchmark.py                                  # 10 个官方 case
+    python benchmark.py --no-suite --synthetic 10 100 1000 --rta
+为了测的是真实计算量，基准总是关闭缓存、不写 CSV 产物。
+--imports 只做导入开销检查：每个模块在全新解释器里用 -X importtime 导入，
+超出 IMPORT_BUDGETS 中的时间上限、或连带导入了不该需要的重型库 (pandas / matplotlib …) 时
+列出并以非零状态退出，可直接放进 CI。
+"""
+
+SCHEMA_VERSION = 1
+
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib")
+# 模块 → (导入耗时上限 ms, 不允许被连带导入的重型库)
+IMPORT_BUDGETS = {
+    "config":             (100,  HEAVY_MODULES),
+    "model":              (100,  HEAVY_MODULES),
+    "timebase":           (100,  HEAVY_MODULES),
+    "cache":              (100,  HEAVY_MODULES),
+    "metrics":            (100,  HEAVY_MODULES),
+    "sim":                (100,  HEAVY_MODULES),
+    "dbf":                (250,  ("pandas", "matplotlib")),
+    "compose":            (250,  ("pandas", "matplotlib")),
+    "sim_trace":          (250,  ("pandas", "matplotlib")),
+    "simulate_full_auto": (250,  ("pandas", "matplotlib")),
+    "rta":                (250,  ("pandas", "matplotlib")),
+    "monte_carlo":        (250,  ("pandas", "matplotlib")),
+    "analyzer":           (250,  ("pandas", "matplotlib")),
+    "pipeline":           (250,  ("pandas", "matplotlib")),
+}
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def import_cost(module):
+    """在新解释器中导入 module，返回 (累计导入耗时 ms, 被连带导入的重型库)。"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC,
+                         capture_output=True, text=True, check=True)
+    us = next(int(line.split("|")[1]) for line in reversed(out.stderr.splitlines())
+              if line.split("|")[-1].strip() == module)
+    return us / 1000, [m for m in out.stdout.strip().split(",") if m]
+
+
+def check_imports():
+    """按 IMPORT_BUDGETS 检查各模块导入开销，返回违规条数。"""
+    bad = 0
+    print(f"{'module':<20} {'ms':>8} {'budget':>7}  heavy")
+    for module, (budget_ms, forbidden) in IMPORT_BUDGETS.items():
+        ms, heavy = import_cost(module)
+        leaked = [m for m in heavy if m in forbidden]
+        ok = ms <= budget_ms and not leaked
+        bad += not ok
+        print(f"{'✅' if ok else '❌'} {module:<18} {ms:8.1f} {budget_ms:7d}  {','.join(heavy) or '-'}"
+              + (f"  (不应导入 {','.join(leaked)})" if leaked else ""))
+    return bad
+
+
+def case_shape(case_dir):
+    tasks = pd.read_csv(Path(case_dir) / "tasks.csv", usecols=["component_id"])
+    cores = pd.read_csv(Path(case_dir) / "architecture.csv", usecols=["core_id"])
+    return len(tasks), tasks["component_id"].nunique(), len(cores)
+
+
+def bench_case(case_dir, source, repeat, **run_kw):
+    """重复运行一个 case，返回 JSON 记录 (阶段耗时取中位数)。"""
+    out_dir = BENCH_ROOT / "runs" / Path(case_dir).name
+    runs = [pipeline.run_case(case_dir, out_dir, write_csv=False, use_cache=False, **run_kw)
+            for _ in range(repeat)]
+    n_tasks, n_comps, n_cores = case_shape(case_dir)
+    ok = all(r["ok"] for r in runs)
+    timings = {stage: statistics.median(r["timings"].get(stage, 0.0) for r in runs)
+               for stage in runs[0]["timings"]}
+    total = sum(timings.values())
+    summary = runs[-1]["summary"] or {}
+    return {
+        "case": Path(case_dir).name,
+        "source": source,
+        "tasks": n_tasks,
+        "components": n_comps,
+        "cores": n_cores,
+        "repeat": repeat,
+        "ok": ok,
+        "error": next((r["error"] for r in runs if r["error"]), None),
+        "timings_s": timings,
+        "total_s": total,
+        "tasks_per_s": n_tasks / total if ok and total > 0 else None,
+        "missed_tasks": summary.get("n_task_bad"),
+        "counters": runs[-1]["metrics"]["counters"],
+        "peak_rss_mb": max((s["peak_rss_mb"] for s in runs[-1]["metrics"]["stages"].values()
+                            if s["peak_rss_mb"] is not None), default=None),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="DRTS 流水线性能基准，结果写成 JSON")
+    ap.add_argument("--no-suite", action="store_true", help="不跑 DRTS_Project-Test-Cases 下的官方 case")
+    ap.add_argument("--synthetic", type=int, nargs="*", default=[],
+                    help="合成 case 的任务数，例如 10 100 1000 100000")
+    ap.add_argument("--components", type=int, default=4, help="合成 case 每核组件数")
+    ap.add_argument("--tasks-per-component", type=int, default=10)
+    ap.add_argument("--util", type=float, default=taskgen.CORE_UTIL)
+    ap.add_argument("--seed", type=int, default=taskgen.GEN_SEED)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--rta", action="store_true", help="用解析 RTA 代替仿真 (大规模合成 case 建议开启)")
+    ap.add_argument("--analyzer-workers", type=int, default=1)
+    ap.add_argument("--sim-workers", type=int, default=1)
+    ap.add_argument("--out", default=None, help="JSON 输出路径 (默认 output/bench/bench-<时间>.json)")
+    ap.add_argument("--imports", action="store_true", help="只检查各模块的导入耗时预算，超标时退出码非零")
+    args = ap.parse_args(argv)
+    if args.imports:
+        sys.exit(1 if check_imports() else 0)
+
+    cases = []
+    if not args.no_suite:
+        cases += [(d, "suite") for d in sorted((f for f in CASES_ROOT.iterdir() if f.is_dir()), key=natural_key)]
+    for n in args.synthetic:
+        case_dir = BENCH_ROOT / "cases" / f"synthetic-{n}-s{args.seed}"
+        cores, comps = taskgen.shape_for(n, args.tasks_per_component, args.components)
+        taskgen.write_case(case_dir, *taskgen.generate(n, cores, comps, args.util, args.seed))
+        cases.append((case_dir, "synthetic"))
+
+    run_kw = dict(analyzer_workers=args.analyzer_workers, sim_workers=args.sim_workers, use_rta=args.rta)
+    records = []
+    print(f"⏱ Benchmarking {len(cases)} cases (repeat={args.repeat}, {'rta' if args.rta else 'simulate'})")
+    for case_dir, source in cases:
+        rec = bench_case(case_dir, source, args.repeat, **run_kw)
+        records.append(rec)
+        stages = "  ".join(f"{k}={v * 1000:.0f}ms" for k, v in rec["timings_s"].items())
+        flag = "✅" if rec["ok"] else "❌"
+        print(f"{flag} {rec['case']:<28} tasks={rec['tasks']:<7} total={rec['total_s']:7.3f}s  {stages}")
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpus": os.cpu_count()},
+        "params": {"repeat": args.repeat, "mode": "rta" if args.rta else "simulate", **run_kw,
+                   "synthetic": {"sizes": args.synthetic, "components_per_core": args.components,
+                                 "tasks_per_component": args.tasks_per_component,
+                                 "util": args.util, "seed": args.seed}},
+        "cases": records,
+    }
+    out = Path(args.out) if args.out else BENCH_ROOT / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✅ 基准结果写入 {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
-import pandas as pd
-import math, os
+import numpy as np
+import argparse, contextlib, io, math, os, time
+from concurrent.futures import ProcessPoolExecutor
 import config
-import matplotlib.pyplot as plt
+import cache
+import compose
+import dbf
+import metrics
+import timebase
+from model import Component, Interface, System, records_to_csv
 
 
 # ---------- Half-Half  α,Δ → Q,P  ----------
@@ -24,11 +30,6 @@ def half_half_to_qp(alpha: float, delta: float):
 3. 搜索 Δ∈[0,200]，对每 Δ 求最小 α = max_t (dbf/(t‑Δ))。
 4. 打印组件明细、首次可行 Δ、最终 α,Δ。
 """
-# --------------------------------------------------
-# 图像输出目录
-# --------------------------------------------------
-PLOT_OUTPUT_DIR = os.path.join(config.OUTPUT_DIR, "plots") #为每个组件生成 dbf vs sbf 折线图
-
 # --------------------------------------------------
 # 参数
 # --------------------------------------------------
@@ -71,25 +72,112 @@ def dbf_rm(tasks_sorted_by_priority, t):
         worst = max(worst, demand)
     return worst
 
+
+def deadline_step_points(tasks, max_t):
+    """DBF 只在绝对截止期 D + k·T 处跳变，两次跳变之间为常数。
+    在整数网格 t∈[1,max_t] 上，dbf/(t−Δ) 在每个常数段内随 t 递减，
+    最大值必落在跳变点之后的第一个整数上，因此只需检查这些点。
+    截止期在 timebase 的整数 tick 域里精确生成并向上取整；
+    每个跳变点同时取 ⌈p⌉ 与 ⌈p⌉+1，吸收 dbf.demand_matrix 浮点求值时的舍入误差。
+    """
+    tb = timebase.TimeBase.of([x for _, T, D in tasks for x in (T, D)])
+    limit = max_t * tb.scale
+    pts = set()
+    for _, T, D in tasks:
+        base = [tb.ceil(x) for x in range(tb.ticks(D), limit + 1, tb.ticks(T))]
+        pts.update(base)
+        pts.update(q + 1 for q in base)
+    return sorted(q for q in pts if 1 <= q <= max_t)
+
+
+def alpha_delta_tradeoff(step_t, step_d, max_t):
+    """由一条预先算好的 DBF 阶梯曲线一次性求出整条 α(Δ) 折衷曲线。
+    DBF 与 Δ 无关，只有分母 (t−Δ) 随 Δ 变化，因此对 Δ=0..DELTA_MAX
+    做一次 (Δ × 测试点) 的矩阵运算即可，无需逐 Δ 重算需求。
+    返回 DataFrame[delta, worst_ratio, alpha, feasible]。
+    """
+    import pandas as pd   # 曲线要写成 alpha_delta_curve.csv，只在真正分析时才加载 pandas
+    deltas = np.arange(DELTA_MAX + 1, dtype=float)
+    d_col = deltas[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(step_t[None, :] > d_col, step_d[None, :] / (step_t[None, :] - d_col), 0.0)
+    worst = ratios.max(axis=1, initial=0.0)
+
+    # Δ+1 落在某个常数段中间时也是该段的最大比值点；
+    # 整数采样的 DBF 只在测试点处变化，故其取值等于左侧最近测试点的 DBF
+    idx = np.searchsorted(step_t, deltas + 1, side="right")
+    d_next = np.concatenate(([0.0], step_d))[idx]
+    worst = np.where(deltas + 1 <= max_t, np.maximum(worst, d_next), worst)
+
+    feasible = worst <= 1.0
+    # alpha = round(math.ceil(worst_ratio / ALPHA_GRAN) * ALPHA_GRAN, 2)
+    alphas = [round((math.ceil(w / ALPHA_GRAN) * ALPHA_GRAN) + 1e-9, 2) if ok else None
+              for w, ok in zip(worst, feasible)]
+    return pd.DataFrame({
+        "delta": deltas.astype(int),
+        "worst_ratio": worst,
+        "alpha": alphas,
+        "feasible": feasible,
+    })
+
+def qpa_refine_tradeoff(tasks, tradeoff):
+    """EDF：逐 Δ 用 QPA 精确校验 α，不通过就在 ALPHA_GRAN 网格上上调，超过 1 记为不可行。
+    截断时限上的 worst_ratio 是精确值的下界，所以只会上调、不会下调。
+    供给 α(t−Δ) 随 α 增大、随 Δ 减小，所以最小可行 α 对 Δ 单调不减：
+    每个 Δ 从 max(下界, 上一个 Δ 的 α) 起先查一次，不通过再在 (起点, 1] 上二分；
+    某个 Δ 在 α=1 仍不通过时，更大的 Δ 全部不可行，不再调用 QPA。"""
+    feasible = tradeoff["feasible"].to_numpy(dtype=bool)
+    if not feasible.any():
+        return tradeoff
+    top = round(1.0 / ALPHA_GRAN)                  # α 网格下标 k ↔ α = k·ALPHA_GRAN
+    lower = tradeoff["alpha"].to_numpy(dtype=float)
+    deltas = tradeoff["delta"].to_numpy()
+    grid = np.full(len(tradeoff), -1)
+
+    def passes(k, delta):
+        return dbf.qpa_edf(tasks, round(k * ALPHA_GRAN, 2), delta)
+
+    prev, raised = 0, 0
+    for i in np.flatnonzero(feasible):
+        lo = max(prev, int(round(lower[i] / ALPHA_GRAN)))
+        if lo <= top and passes(lo, deltas[i]):
+            k = lo
+        elif lo >= top or not passes(top, deltas[i]):
+            break                                  # 该 Δ 及之后全部不可行
+        else:
+            bad, k = lo, top                       # passes(bad) 为假、passes(k) 为真
+            while k - bad > 1:
+                mid = (bad + k) // 2
+                bad, k = (bad, mid) if passes(mid, deltas[i]) else (mid, k)
+        grid[i] = prev = k
+        raised += k != int(round(lower[i] / ALPHA_GRAN))
+    raised += int((feasible & (grid < 0)).sum())
+
+    tradeoff = tradeoff.copy()
+    tradeoff["feasible"] = grid >= 0
+    tradeoff["alpha"] = np.where(grid >= 0, np.round(grid * ALPHA_GRAN, 2), np.nan)
+    print(f"       ↻ 时限截断，QPA 精确校验 α(Δ)：上调 {raised} 个 Δ")
+    return tradeoff
+
+
 # --------------------------------------------------
 # 逐组件分析
 # --------------------------------------------------
 
-def analyze_component(df_comp: pd.DataFrame):
-    comp_id = df_comp["component_id"].iloc[0]
-    scheduler = df_comp["scheduler"].iloc[0].strip().upper()
+def analyze_component(comp: Component, plots=False):
+    """plots=True 时 DBF 曲线额外延伸到绘图时限 (最大周期 × TEST_HORIZON_FACTOR) 供 plot_dbf 复用；
+    不画图时只算到分析时限 max_t。"""
+    comp_id = comp.component_id
+    scheduler = comp.analysis_scheduler()
+    comp_tasks = comp.tasks
 
-    # RM 任务需按优先级排序（priority 列数值越小优先级越高）
+    # RM 任务需按优先级排序（priority 数值越小优先级越高）
     if scheduler == "RM":
-        df_comp = df_comp.sort_values("priority")
-        # —— 合法性检查：Period 越小 priority 应越高
-        if not df_comp.sort_values("period")["priority"].is_monotonic_increasing:
-            print(f"⚠️  {comp_id}: RM priority 与 period 不一致 → 退化为 EDF 分析")
-            scheduler = "EDF"  # 用最保守公式
-    # 若没有 deadline 列则按要求补 = period
-    if "deadline" not in df_comp.columns:
-        df_comp["deadline"] = df_comp["period"]
-    tasks = list(zip(df_comp["wcet"], df_comp["period"], df_comp["deadline"]))
+        comp_tasks = sorted(comp_tasks, key=lambda t: t.priority)
+    elif comp.scheduler == "RM":
+        print(f"⚠️  {comp_id}: RM priority 与 period 不一致 → 退化为 EDF 分析")
+    # deadline 缺省时模型中已补 = period
+    tasks = [(t.wcet, t.period, t.deadline) for t in comp_tasks]
 
 
     #max_period = df_comp["period"].max()
@@ -99,117 +187,155 @@ def analyze_component(df_comp: pd.DataFrame):
     # 用任务周期的最小公倍数 (hyperperiod) 作为观察窗口上界，
     # 再至少取一倍 Δ_MAX，避免漏掉“错位”间隔。
     # 若 LCM 过大，限定在 10 000。
-    from math import lcm
-    periods = df_comp["period"].astype(int).tolist()
-    try:
-        hyper = lcm(*periods)
-    except OverflowError:          # 非整数或太大
-        hyper = max(periods) * 10
-    max_t = min(max(DELTA_MAX * 2, hyper), 10_000)
-    test_points = range(1, int(max_t) + 1)
-
-
-    test_points = range(1, int(max_t) + 1)
-
-    print(f"\n[COMP] {comp_id}  sched={scheduler}  tasks={len(tasks)}  max_t={max_t}")
+    # 非整数周期由 timebase 按有理数精确求 LCM，不再 int() 截断
+    hyper = timebase.hyperperiod(t.period for t in comp_tasks)
+    max_t = min(max(DELTA_MAX * 2, math.ceil(hyper)), 10_000)
+
+    # ---------- DBF 曲线：每组件只算一次 ----------
+    # 需要出图时覆盖分析时限与绘图时限中较大者，分析只取 t ≤ max_t 的部分，绘图直接复用
+    curve_end = max_t
+    if plots:
+        curve_end = max(max_t, max(t.period for t in comp_tasks) * TEST_HORIZON_FACTOR)
+    with metrics.timer("analyze.dbf_curve"):
+        curve_t = np.array(deadline_step_points(tasks, int(curve_end)), dtype=float)
+        curve_d = dbf.dbf_curve(scheduler, tasks, curve_t)
+    curve = (curve_t, curve_d)
+    in_horizon = curve_t <= max_t
+    step_t, step_d = curve_t[in_horizon], curve_d[in_horizon]
+    metrics.add("analyze.test_points", len(step_t))
+
+    print(f"\n[COMP] {comp_id}  sched={scheduler}  tasks={len(tasks)}  max_t={max_t}  "
+          f"test_points={len(step_t)}")
     for idx, (C, T, D) in enumerate(tasks, 1):
         util = C / T  # 单任务利用率
         bar = "█" * int(util * 20)  # 0-1 → 0-20 格
         print(f"       └─ Task{idx:<2}: C={C:<4} T={T:<4} D={D:<4} "
               f"U={util:4.2f} {bar}")
 
+    # 整条 α(Δ) 曲线一次算出；Δ 越小越优先，取第一个可行且 α≤1 的 Δ
+    with metrics.timer("analyze.delta_search"):
+        tradeoff = alpha_delta_tradeoff(step_t, step_d, max_t)
+    # 时限被截断 (超周期 > max_t 或周期非整数) 时，EDF 组件的 α 只是下界，用 QPA 补成精确值
+    truncated = hyper > max_t or any(t.period != int(t.period) or t.deadline != int(t.deadline)
+                                     for t in comp_tasks)
+    if scheduler == "EDF" and truncated:
+        with metrics.timer("analyze.qpa_refine"):
+            tradeoff = qpa_refine_tradeoff(tasks, tradeoff)
     best = None  # (Δ,α)
-    for delta in range(DELTA_MAX + 1):
-        worst_ratio = 0.0
-        feasible = True
-        for t in test_points:
-            if t <= delta:
-                continue
-            if scheduler == "EDF":
-                demand = dbf_edf(tasks, t)
-            else:  # RM
-                demand = dbf_rm(tasks, t)
-            ratio = demand / (t - delta)
-            if ratio > 1.0:
-                feasible = False
-                break
-            worst_ratio = max(worst_ratio, ratio)
-        if feasible:
-            # alpha = round(math.ceil(worst_ratio / ALPHA_GRAN) * ALPHA_GRAN, 2)
-            alpha = round((math.ceil(worst_ratio / ALPHA_GRAN) * ALPHA_GRAN) + 1e-9, 2)
-            if alpha > 1.0:
-                continue
-            print(f"       ✓ first feasible at Δ={delta}, α={alpha}")
-            if best is None or delta < best[0] or (delta == best[0] and alpha < best[1]):
-                best = (delta, alpha)
+    usable = tradeoff[tradeoff["feasible"] & (tradeoff["alpha"] <= 1.0)]
+    if not usable.empty:
+        first = usable.iloc[0]
+        best = (int(first["delta"]), float(first["alpha"]))
+        print(f"       ✓ first feasible at Δ={best[0]}, α={best[1]}  "
+              f"(feasible Δ: {len(usable)}/{len(tradeoff)})")
     if best:
         print(f"       → chosen Δ={best[0]}, α={best[1]}")
-        return True, best[1], best[0]
+        return True, best[1], best[0], curve, tradeoff
     print("       ✗ UNSCHEDULABLE within search bounds")
-    return False, None, None
+    return False, None, None, curve, tradeoff
 
 
 # --------------------------------------------------
-# dbf vs sbf 折线图
+# 组件并行分析
 # --------------------------------------------------
-def plot_dbf_vs_sbf(comp_id, scheduler, tasks, alpha, delta, max_t):
-    ts = list(range(1, int(max_t) + 1))
-    dbfs, sbfs = [], []
-
-    for t in ts:
-        if scheduler == "EDF":
-            dbf = dbf_edf(tasks, t)
+def _analyze_job(comp, plots=False):
+    """单组件分析任务（可在子进程中运行）。
+    日志先写进缓冲区，由主进程按组件顺序统一打印，避免多进程输出交错；
+    计数 / 计时同样单独收集，随结果送回主进程合并。"""
+    buf = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(buf), metrics.collecting() as m:
+        res = analyze_component(comp, plots)
+    return res, buf.getvalue(), time.perf_counter() - t0, m.as_dict()
+
+
+def analyzer_params():
+    """影响分析结果的全部参数，参与缓存键。"""
+    return (DELTA_MAX, ALPHA_GRAN, TEST_HORIZON_FACTOR,
+            ENABLE_PEAK_INTERFACE_CHECK, ENABLE_DELAY_PEAK_CHECK)
+
+
+def component_key(comp: Component, plots=False):
+    """单组件缓存键：只取决于该组件自身的调度器与任务参数 (以及 DBF 曲线是否延伸到绘图时限)。"""
+    tasks = tuple((t.name, t.wcet, t.period, t.deadline, t.priority) for t in comp.tasks)
+    return cache.digest("comp", comp.component_id, comp.scheduler, tasks, analyzer_params(), bool(plots))
+
+
+def analyze_components(system: System, workers=1, result_cache=None, plots=False):
+    """逐组件分析，按 component_id 顺序返回 [(component, 分析结果), ...]。
+    workers > 1 时用进程池并行；结果顺序与串行完全一致。
+    给定 result_cache 时先查缓存，只有未命中的组件才真正分析。"""
+    comps = [system.components[cid] for cid in sorted(system.components)]
+    keys = [component_key(c, plots) for c in comps] if result_cache else [None] * len(comps)
+    outs = [result_cache.get("comp", k) if k else None for k in keys]
+    todo = [i for i, out in enumerate(outs) if out is None]
+    recomputed = set(todo)
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(_analyze_job, [comps[i] for i in todo], [plots] * len(todo)))
+    else:
+        fresh = [_analyze_job(comps[i], plots) for i in todo]
+    for i, out in zip(todo, fresh):
+        outs[i] = out
+        if result_cache:
+            result_cache.put("comp", keys[i], out)
+
+    analyzed = []
+    for i, (comp, (res, log, elapsed, comp_metrics)) in enumerate(zip(comps, outs)):
+        print(log, end="")
+        if i in recomputed:
+            print(f"       ⏱ {comp.component_id} analyzed in {elapsed * 1000:.1f} ms")
+            metrics.merge(comp_metrics)
+            metrics.record("components", comp.component_id, {
+                "scheduler": comp.scheduler, "tasks": len(comp.tasks), "cached": False,
+                "ms": elapsed * 1000, **comp_metrics["counters"]})
         else:
-            dbf = dbf_rm(tasks, t)
-        dbfs.append(dbf)
-        sbfs.append(max(0, alpha * (t - delta)) if t > delta else 0)
-
-    plt.figure()
-    plt.plot(ts, dbfs, label="DBF", linewidth=2)
-    plt.plot(ts, sbfs, label="SBF", linestyle="--", linewidth=2)
-    plt.xlabel("Time (t)")
-    plt.ylabel("Resource Demand / Supply")
-    plt.title(f"{comp_id} ({scheduler})")
-    plt.legend()
-    plt.grid(True)
-
-    os.makedirs(PLOT_OUTPUT_DIR, exist_ok=True)
-    out_path = os.path.join(PLOT_OUTPUT_DIR, f"{comp_id}_dbf_vs_sbf.png")
-    plt.savefig(out_path)
-    plt.close()
-    print(f"       📊 Plot saved to {out_path}")
+            print(f"       ♻️ {comp.component_id} 命中缓存，跳过分析")
+            metrics.add("analyze.cache_hits")
+            metrics.record("components", comp.component_id, {
+                "scheduler": comp.scheduler, "tasks": len(comp.tasks), "cached": True})
+        analyzed.append((comp, res))
+    if result_cache:
+        print(f"\n=== 组件缓存：命中 {len(comps) - len(todo)} / {len(comps)} ===")
+    return analyzed
+
 
 # --------------------------------------------------
 # 主程
 # --------------------------------------------------
 
-def main():
-
-    df = pd.read_csv(config.PREPROCESSED_TASKS_PATH)
-    print(f"=== Analyzer 启动：读取 {len(df)} task‑rows ===")
+def analyze_system(system: System, workers=1, result_cache=None, plots=False):
+    """对内存模型完成全部分析。
+    返回 (interfaces, α(Δ) 曲线 DataFrame, {component_id: (测试点, DBF)})；
+    DBF 阶梯曲线供 plot_dbf.py 绘图直接复用，分析本身不画图。
+    result_cache (cache.ResultCache) 非 None 时复用未改动组件的分析结果；
+    plots 为真时 DBF 曲线延伸到绘图时限，否则只覆盖分析时限。"""
+    workers = workers or os.cpu_count() or 1
+    print(f"=== Analyzer 启动：{len(system.tasks)} tasks / {len(system.components)} components (workers={workers}) ===")
 
     results = []
-    for comp_id, group in df.groupby("component_id"):
-        ok, alpha, delta = analyze_component(group)
+    tradeoffs = []
+    curves = {}
+    t0 = time.perf_counter()
+    analyzed = analyze_components(system, workers, result_cache, plots)
+    print(f"\n=== 组件分析耗时 {(time.perf_counter() - t0) * 1000:.1f} ms ===")
+    for comp, (ok, alpha, delta, curve, tradeoff) in analyzed:
+        comp_id = comp.component_id
+        tradeoffs.append(tradeoff.assign(component_id=comp_id))
+        curves[comp_id] = curve
         # ---------- 组件级结论 ----------
         print(f"▶ 组件 {comp_id:<20}……"
               f"{'可调度' if ok else '不可调度'}"
               f"  (α={alpha if alpha is not None else '-'}, Δ={delta if delta is not None else '-'})")
-
-        if ok:
-            scheduler = group["scheduler"].iloc[0].strip().upper()
-            tasks = list(zip(group["wcet"], group["period"], group.get("deadline", group["period"])))
-            max_period = group["period"].max()
-            max_t = max_period * TEST_HORIZON_FACTOR
-            plot_dbf_vs_sbf(comp_id, scheduler, tasks, alpha, delta, max_t)
-        results.append({
-            "component_id": comp_id,
-            "core_id": group["core_id"].iloc[0],
-            "scheduler": group["scheduler"].iloc[0].strip().upper(),
-            "alpha": alpha,
-            "delta": delta,
-            "schedulable": ok,
-        })
+        results.append(Interface(
+            component_id=comp_id,
+            core_id=comp.core_id,
+            scheduler=comp.scheduler,
+            alpha=alpha,
+            delta=delta,
+            schedulable=ok,
+        ))
 
     # ------------------------------------------------------------
     # 新：核心 (core) 超载检查
@@ -227,10 +353,10 @@ def main():
     #     • system_schedulable   True / False  —— 全局视角，可调度 = 组件可调度且核心未超载
     core_load = {}
     for r in results:
-        if r["alpha"] is None:  # 组件本身就不可调度 → 视为∞负荷
-            core_load[r["core_id"]] = float("inf")
+        if r.alpha is None:  # 组件本身就不可调度 → 视为∞负荷
+            core_load[r.core_id] = float("inf")
         else:
-            core_load[r["core_id"]] = core_load.get(r["core_id"], 0.0) + r["alpha"]
+            core_load[r.core_id] = core_load.get(r.core_id, 0.0) + r.alpha
 
     # 找出 Σα > 1.01 的核心
     overloaded_cores = {cid: load for cid, load in core_load.items() if load > 1.01}
@@ -250,82 +376,30 @@ def main():
 
     # 把标记写回每条结果
     for r in results:
-        r["core_overloaded"] = r["core_id"] in overloaded_cores
-        r["system_schedulable"] = (not r["core_overloaded"]) and r["schedulable"]
+        r.core_overloaded = r.core_id in overloaded_cores
+        r.system_schedulable = (not r.core_overloaded) and r.schedulable
 
 
     # ====== ★ 接口可调度性（Theorem-1）检查 ★ ======
     # 1) 收集每核子接口供应任务 (Q,P) —— 与 sim.py 的公式保持一致
     core_supplies = {}
     for r in results:
-        if not r["schedulable"]:
+        if not r.schedulable:
             continue
         try:
-            Q, P = half_half_to_qp(r["alpha"], r["delta"])
+            Q, P = half_half_to_qp(r.alpha, r.delta)
         except ValueError:
             continue
-        core_supplies.setdefault(r["core_id"], []).append((Q, P))
-
-    # 2) 父层 EDF-DBF 可调度性：SBF=t，检查 DBF<=t
-    def dbf_periodic(ts, t):
-        # return sum(math.floor((t - C) / T + 1) * C if t >= C else 0 for C, T in ts)
-        return sum(math.ceil(t / T) * C for C, T in ts) #这样和教材《分布式实时系统…》公式 (2) 保持一致，又远离 “小数 + floor” 的误差陷阱。
-
-    # ---------- 接口可调度性检查 ----------
-    def _util_check(core_sup):
-        # 旧判据：只看平均利用率
-        return {
-            core for core, lst in core_sup.items()
-            if sum(Q / P for Q, P in lst) > 1.0 + 1e-6
-        }
-
-    def _peak_check(core_sup):
-        # 新判据：Theorem-1 —— 任一窗口 DBF<=t (父层供给)
-        def dbf(lst, t):
-            #return sum(math.ceil(t / P) * Q for Q, P in lst)
-            return sum(max(0, (math.floor((t - P) / P) + 1)) * Q
-                       if t >= P else 0
-                       for Q, P in lst)
-
-        unsched = set()
-        for core, lst in core_sup.items():
-            if not lst:
-                continue
-            try:
-                hp = math.lcm(*[int(P) for _, P in lst])
-            except OverflowError:
-                hp = max(P for _, P in lst) * 10
-            max_t = min(hp, 10_000)
-            for t in range(1, max_t + 1):
-                if dbf(lst, t) > t + 1e-6:  # 父层 SBF == t
-                    unsched.add(core)
-                    break
-        return unsched
-
-    # --- BDR Δ-delay 峰值检查 ---
-    def _delay_check(core_sup):
-        """
-        Theorem-1 for BDR interfaces:
-        Σ α_i·max(0, t−Δ_i) ≤ t   ∀t>0
-        α_i = Q/P ,  Δ_i = P−Q
-        只需检查临界点 t ∈ {Δ_i}
-        """
-        unsched = set()
-        for core, lst in core_sup.items():
-            pairs = [(Q / P, P - Q) for Q, P in lst]
-            for t in {int(d) for _, d in pairs} | {0}:
-                demand = sum(a * max(0, t - d) for a, d in pairs)
-                if demand > t + 1e-6:  # 父层 SBF = t
-                    unsched.add(core)
-                    break
-        return unsched
+        core_supplies.setdefault(r.core_id, []).append((Q, P))
 
+    # 2) 父层 Theorem-1：全部核心交给 compose.py 一次向量化判定 (断点精确扫描，无时间上限)
     if ENABLE_DELAY_PEAK_CHECK:
-        interface_unsched = _delay_check(core_supplies)
+        check = "bdr"      # Σ α_i·max(0, t−Δ_i) ≤ t
     elif ENABLE_PEAK_INTERFACE_CHECK:
-        interface_unsched = _peak_check(core_supplies)
+        check = "dbf"      # 供给任务 (Q,P) 的 DBF ≤ t
     else:
-        interface_unsched = _util_check(core_supplies)
+        check = "util"     # 旧判据：只看平均利用率
+    interface_unsched = compose.unschedulable_cores(core_supplies, check)
 
     if interface_unsched:
         print("🚨 进行接口可调度性检查……失败(失败核心:", ", ".join(interface_unsched))
@@ -333,106 +407,93 @@ def main():
         print("✅ 进行接口可调度性检查……通过")
 
     for r in results:
-        r["interface_unsched"] = r["core_id"] in interface_unsched
-        if r["interface_unsched"]:
-            r["system_schedulable"] = False
+        r.interface_unsched = r.core_id in interface_unsched
+        if r.interface_unsched:
+            r.system_schedulable = False
 
 
 
 
 
     # ====== ★ 父接口预算覆盖检查（可迭代）★ ======
-    # 前提：budgets.csv 至少含 alpha_budget, delta_budget, component_id 三列
+    # 预算 (alpha_budget, delta_budget) 已在预处理时由 budgets.csv 换算进 Component
     # ------------------------------------------------
-    try:
-        budgets_df = pd.read_csv(config.BUDGETS_PATH)
-
-        # ---------- ① 若文件是 (budget, period) 表头，先换算出 alpha_budget, delta_budget ----------
-        if {"budget", "period"}.issubset(budgets_df.columns):
-            bdg = budgets_df.copy()
-            bdg["alpha_budget"] = bdg["budget"] / bdg["period"]
-            bdg["delta_budget"] = bdg["period"] - bdg["budget"]
-            budgets_df = bdg  # 后续统一使用包含新列的 DataFrame
-
-        # ---------- ② 别名兼容（含刚刚换算出的列） ----------
-        alias = {
-            "component_id": {"component_id", "comp_id", "cid"},
-            "alpha_budget": {"alpha_budget"},
-            "delta_budget": {"delta_budget"},
-        }
-        colmap = {}
-        for std, cand in alias.items():
-            for col in budgets_df.columns:
-                if col.lower() in {x.lower() for x in cand}:
-                    colmap[std] = col
-                    break
-
-        missing = [std for std in alias if std not in colmap]
-        if missing:
-            print(f"\n❌ budgets.csv 缺字段 {missing} → 覆盖检查被跳过")
-            for r in results:
-                r["budget_violate"] = None
-            bdg_map = {}
-        else:
-            # 只保留三列并统一列名
-            budgets_df = budgets_df[[colmap["component_id"],
-                                     colmap["alpha_budget"],
-                                     colmap["delta_budget"]]]
-            budgets_df.columns = ["component_id", "alpha_budget", "delta_budget"]
-            bdg_map = budgets_df.set_index("component_id")[["alpha_budget", "delta_budget"]].to_dict("index")
-
-            # ---------- ★ 父预算覆盖实际比对 ★ ----------
-            violate_any = False
-            for r in results:
-                need_a, need_d = r["alpha"], r["delta"]
-                cid = r["component_id"]
-                if cid not in bdg_map or need_a is None:
-                    r["budget_violate"] = None
-                    continue
-                bud_a = bdg_map[cid]["alpha_budget"]
-                bud_d = bdg_map[cid]["delta_budget"]
-                violate = (need_a > bud_a + 1e-6) or (need_d > bud_d + 1e-6)
-                r["budget_violate"] = violate
-                if violate:
-                    violate_any = True
-                    r["system_schedulable"] = False
-                    print(f"   • {cid}: 需求(α={need_a:.2f},Δ={need_d}) > 预算(α={bud_a:.2f},Δ={bud_d}) ❌")
-            if violate_any:
-                print("🚨 进行父预算覆盖检查……失败")
-            if not violate_any:
-                print("✅ 进行父预算覆盖检查……通过(全部子组件需求被父预算覆盖)")
-            # ---------- ★ 比对结束 ★ ----------
+    if all(c.alpha_budget is None for c in system.components.values()):
+        print("\nℹ️ 组件无父预算信息，跳过父预算检查")
+    else:
+        # ---------- ★ 父预算覆盖实际比对 ★ ----------
+        violate_any = False
+        for r in results:
+            comp = system.components[r.component_id]
+            need_a, need_d = r.alpha, r.delta
+            cid = r.component_id
+            if comp.alpha_budget is None or need_a is None:
+                r.budget_violate = None
+                continue
+            bud_a = comp.alpha_budget
+            bud_d = comp.delta_budget
+            violate = (need_a > bud_a + 1e-6) or (need_d > bud_d + 1e-6)
+            r.budget_violate = violate
+            if violate:
+                violate_any = True
+                r.system_schedulable = False
+                print(f"   • {cid}: 需求(α={need_a:.2f},Δ={need_d}) > 预算(α={bud_a:.2f},Δ={bud_d}) ❌")
+        if violate_any:
+            print("🚨 进行父预算覆盖检查……失败")
+        if not violate_any:
+            print("✅ 进行父预算覆盖检查……通过(全部子组件需求被父预算覆盖)")
+        # ---------- ★ 比对结束 ★ ----------
 
 
 
+    # ====== ★ Case 总体可调度性 ★ ======
+    case_schedulable = all(r.system_schedulable for r in results)
+    print("Case verdict:",
+          "✅ SCHEDULABLE" if case_schedulable else "❌ UNSCHEDULABLE")
+    for r in results:
+        r.case_schedulable = case_schedulable
 
 
-    except FileNotFoundError:
-        print("\nℹ️ 未找到 budgets.csv，跳过父预算检查")
-        for r in results: r["budget_violate"] = None
 
+    # α(Δ) 折衷曲线：供后续预算调优直接查表，无需重跑分析
+    import pandas as pd
+    curve_df = pd.concat(tradeoffs, ignore_index=True)
+    curve_df = curve_df[["component_id", "delta", "worst_ratio", "alpha", "feasible"]]
+    return results, curve_df, curves
 
 
-    # ====== ★ Case 总体可调度性 ★ ======
-    case_schedulable = all(r["system_schedulable"] for r in results)
-    print("Case verdict:",
-          "✅ SCHEDULABLE" if case_schedulable else "❌ UNSCHEDULABLE")
-    for r in results:
-        r["case_schedulable"] = case_schedulable
+def write_results(interfaces, curve_df, paths: config.CasePaths):
+    records_to_csv(interfaces, paths.analysis_result_path)
+    curve_df.to_csv(paths.alpha_delta_curve_path, index=False)
+    print(f"\n分析完成，结果写入 {paths.analysis_result_path}")
+    print(f"α(Δ) 曲线写入 {paths.alpha_delta_curve_path}\n")
 
 
+def analyze(paths: config.CasePaths, workers=1, plots=None):
+    """由 paths 下的原始输入构建模型并分析，写出 analysis_result.csv / alpha_delta_curve.csv。
+    plots 为 "png" / "pdf" 时另外把 dbf vs sbf 图写入 paths.plot_dir。"""
+    import preprocess_data   # 读 CSV 依赖 pandas，import analyzer 本身不加载
+    system = preprocess_data.load_system(paths)
+    interfaces, curve_df, curves = analyze_system(system, workers, plots=bool(plots))
+    write_results(interfaces, curve_df, paths)
+    if plots:
+        import plot_dbf
+        plot_dbf.plot_system(system, interfaces, curves, paths.plot_dir, workers, plots)
+    return interfaces
 
-    os.makedirs(os.path.dirname(config.ANALYSIS_RESULT_PATH), exist_ok=True)
-    pd.DataFrame(results).to_csv(config.ANALYSIS_RESULT_PATH, index=False)
-    print(f"\n分析完成，结果写入 {config.ANALYSIS_RESULT_PATH}\n")
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="组件级 (α, Δ) 接口分析")
+    ap.add_argument("--workers", type=int, default=config.ANALYZER_WORKERS,
+                    help="并行分析组件的进程数；1=串行，0=使用全部 CPU 核心")
+    ap.add_argument("--plots", nargs="?", const="png", choices=["png", "pdf"], default=None,
+                    help="输出 dbf vs sbf 图 (png=每组件一张，pdf=合并为一个多页文件)")
+    args = ap.parse_args(argv)
 
+    analyze(config.current_paths(), args.workers, args.plots)
 
 
 
-bud = pd.read_csv(config.BUDGETS_PATH)
-print("\n=== budgets.csv columns ===")
-print(list(bud.columns))          # ← 真实列名就在这里
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+import hashlib, os, pickle, tempfile
+
+"""cache.py — 按内容哈希的结果缓存 (LRU，按总字节数限容)
+--------------------------------------------------
+键 = 输入内容 + 分析/仿真参数 的 sha256；值用 pickle 存成 <root>/<ns>-<key>.pkl。
+  ns="comp"  单组件 (α,Δ) 分析结果：只要该组件的任务不变就命中，
+             某个组件的任务改了，只有它会重新分析
+  ns="sim"   整个 case 的仿真结果行：三个输入文件 + 全部参数都不变才命中
+命中时刷新文件 mtime；写入后若总大小超过 max_bytes，按 mtime 从旧到新淘汰。
+写入先落临时文件再 os.replace，多个进程同时读写同一目录也不会读到半个文件。
+"""
+
+CACHE_VERSION = 4   # 结果格式 / 算法改动时 +1，旧条目自然失效
+
+
+def digest(*parts):
+    """任意可 repr 的对象 → sha256 十六进制串。"""
+    h = hashlib.sha256(repr((CACHE_VERSION,) + parts).encode("utf-8"))
+    return h.hexdigest()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, ns, key):
+        return os.path.join(self.root, f"{ns}-{key}.pkl")
+
+    def get(self, ns, key):
+        path = self._path(ns, key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)               # LRU：命中即视为最近使用
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, ns, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(ns, key))
+        self.evict()
+
+    def evict(self):
+        """总大小超限时删除最久未使用的条目。"""
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.root, name))
+            except FileNotFoundError:    # 另一个进程刚删掉
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+            total -= size
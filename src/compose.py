@@ -0,0 +1,131 @@
+import numpy as np
+import dbf
+import metrics
+
+"""compose.py — 核心级接口组合检查 (父层 Theorem-1)
+--------------------------------------------------
+每个可调度组件经 Half-Half 得到供给任务 (Q, P)，同一核心上的供给任务要能被父层供给
+sbf_p(t) = α_p·max(0, t − Δ_p) 满足 (专用核心 α_p = 1, Δ_p = 0，即 sbf = t)。
+三种判据，全部核心一次向量化完成 (按 (核心, 时间) lexsort 后分组前缀和)：
+    "bdr"   Σ α_i·max(0, t − Δ_i) ≤ sbf_p(t)  ∀t，α_i = Q/P，Δ_i = P − Q
+            两边都是分段线性函数，断点只有 {Δ_i} ∪ {Δ_p}：在排序后的断点处用前缀和
+            A = Σα_i、B = Σα_i·Δ_i 求 demand(t) = A·t − B，再检查最后一段斜率 Σα_i − α_p，
+            每核 O(k log k)，没有时间上限，也不再把 Δ_i 截成整数。
+    "dbf"   把供给任务视为 D = P 的周期任务，dbf(t) ≤ sbf_p(t)：枚举 [0, L] 内全部截止期，
+            排序后的前缀和就是 dbf 阶梯；L 取 dbf.qpa_bound 的 La (D = P 时为 max(P, α_pΔ_p/(α_p − U)))，
+            U = α_p 时直接判定 (Δ_p = 0 可调度)；L 内截止期超过 SWEEP_MAX_DEADLINES 的核心退回 dbf.qpa_edf。
+    "util"  Σ Q/P ≤ α_p (旧判据，只看平均利用率)。
+"""
+
+COMPOSE_EPS = 1e-6   # 需求 / 供给比较的容差 (与旧 _delay_check 一致)
+SWEEP_MAX_DEADLINES = 1_000_000   # "dbf" 判据单核枚举截止期的上限，超过则该核改用 QPA
+CHECKS = ("bdr", "dbf", "util")
+
+
+def supply_arrays(core_supplies):
+    """{core_id: [(Q, P), ...]} → (core_ids, 核心编码, Q, P)。"""
+    core_ids = list(core_supplies)
+    counts = [len(core_supplies[c]) for c in core_ids]
+    code = np.repeat(np.arange(len(core_ids)), counts)
+    qp = np.array([qp for c in core_ids for qp in core_supplies[c]], dtype=float).reshape(-1, 2)
+    return core_ids, code, qp[:, 0], qp[:, 1]
+
+
+def _groups(code):
+    """已按 code 排好序 → 每组起点与长度。"""
+    starts = np.flatnonzero(np.r_[True, code[1:] != code[:-1]])
+    return starts, np.diff(np.r_[starts, len(code)])
+
+
+def _group_cumsum(x, starts, counts):
+    cs = np.cumsum(x)
+    return cs - np.repeat(cs[starts] - x[starts], counts)
+
+
+# --------------------------------------------------
+# 判据
+# --------------------------------------------------
+def util_sweep(code, Q, P, n_cores, parent_alpha=1.0):
+    return np.bincount(code, Q / P, n_cores) <= parent_alpha + COMPOSE_EPS
+
+
+def bdr_sweep(code, alpha, delta, n_cores, parent_alpha=1.0, parent_delta=0.0):
+    """每个核心编码 → Σ α_i·max(0, t − Δ_i) ≤ α_p·max(0, t − Δ_p) 对所有 t 是否成立。"""
+    # 每核补一个父层断点 Δ_p (α = 0，不改变需求，只提供检查点)；没有组件的核心也因此各成一组
+    code  = np.concatenate((code, np.arange(n_cores)))
+    alpha = np.concatenate((alpha, np.zeros(n_cores)))
+    delta = np.concatenate((delta, np.full(n_cores, float(parent_delta))))
+    order = np.lexsort((delta, code))
+    code, alpha, delta = code[order], alpha[order], delta[order]
+    starts, counts = _groups(code)
+    A = _group_cumsum(alpha, starts, counts)            # Σ_{Δ_i ≤ t} α_i
+    B = _group_cumsum(alpha * delta, starts, counts)    # Σ_{Δ_i ≤ t} α_i·Δ_i
+    # t = Δ_j 处与 Δ_j 相同的后续断点贡献为 0，所以按行计算即可
+    excess = A * delta - B - parent_alpha * np.maximum(0.0, delta - parent_delta)
+    peak = np.maximum.reduceat(excess, starts)
+    slope = A[starts + counts - 1] - parent_alpha       # 最后一个断点之后的斜率
+    metrics.add("compose.breakpoints", len(code))
+    return (peak <= COMPOSE_EPS) & (slope <= COMPOSE_EPS)
+
+
+def dbf_sweep(code, Q, P, n_cores, parent_alpha=1.0, parent_delta=0.0):
+    """每个核心编码 → 供给任务 (Q, P, D = P) 的 dbf(t) ≤ α_p·max(0, t − Δ_p) 是否成立。"""
+    eps = dbf.QPA_EPS
+    U = np.bincount(code, Q / P, n_cores)
+    P_max = np.zeros(n_cores)
+    np.maximum.at(P_max, code, P)
+    slack = parent_alpha - U
+    ok = slack >= -eps                                   # U > α_p：长期需求超过供给
+    # U = α_p：D = P 时 dbf(t) ≤ U·t = α_p·t，Δ_p = 0 恰好可调度，Δ_p > 0 必不可调度
+    tight = ok & (slack <= eps)
+    ok[tight] = parent_delta == 0
+    L = np.maximum(P_max, parent_alpha * parent_delta / np.where(tight | ~ok, 1.0, slack))
+    n = np.floor(L[code] / P + eps).astype(np.int64)    # 每个供给任务在 [0, L] 内的截止期个数
+    # U 逼近 α_p 使 L 内截止期过多的核心：逐核退回 dbf.qpa_edf (从 L 往回跳，不枚举)
+    fallback = ok & ~tight & (np.bincount(code, n, n_cores) > SWEEP_MAX_DEADLINES)
+    for c in np.flatnonzero(fallback):
+        m = code == c
+        ok[c] = dbf.qpa_edf(list(zip(Q[m], P[m], P[m])), parent_alpha, parent_delta)
+
+    # 其余核心：枚举 [0, L] 内全部截止期 k·P_i，一次排序
+    m = (ok & ~tight & ~fallback)[code]
+    c, q, p, n = code[m], Q[m], P[m], n[m]
+    rep = np.repeat(np.arange(len(p)), n)
+    k = np.arange(len(rep)) - np.repeat(np.cumsum(n) - n, n) + 1
+    t, c, q = k * p[rep], c[rep], q[rep]
+    metrics.add("compose.deadlines", len(t))
+    if len(t) == 0:
+        return ok
+    order = np.lexsort((t, c))
+    t, c, q = t[order], c[order], q[order]
+    starts, counts = _groups(c)
+    demand = _group_cumsum(q, starts, counts)           # 同一截止期的最后一行才是完整 dbf，前面的更小，不影响判定
+    bad = demand > parent_alpha * np.maximum(0.0, t - parent_delta) + COMPOSE_EPS
+    ok[c[starts][np.add.reduceat(bad, starts) > 0]] = False
+    return ok
+
+
+# --------------------------------------------------
+# 入口
+# --------------------------------------------------
+def schedulable_cores(core_supplies, check="bdr", parent_alpha=1.0, parent_delta=0.0):
+    """{core_id: [(Q, P), ...]} → {core_id: 是否满足父层 Theorem-1}。"""
+    if check not in CHECKS:
+        raise ValueError(f"未知组合判据: {check}")
+    core_ids, code, Q, P = supply_arrays(core_supplies)
+    if not core_ids:
+        return {}
+    n = len(core_ids)
+    with metrics.timer(f"compose.{check}"):
+        if check == "bdr":
+            ok = bdr_sweep(code, Q / P, P - Q, n, parent_alpha, parent_delta)
+        elif check == "dbf":
+            ok = dbf_sweep(code, Q, P, n, parent_alpha, parent_delta)
+        else:
+            ok = util_sweep(code, Q, P, n, parent_alpha)
+    return dict(zip(core_ids, ok.tolist()))
+
+
+def unschedulable_cores(core_supplies, check="bdr", parent_alpha=1.0, parent_delta=0.0):
+    return {core for core, ok in schedulable_cores(core_supplies, check, parent_alpha, parent_delta).items()
+            if not ok}
@@ -1,6 +1,7 @@
 # config.py
 
 import os
+from dataclasses import dataclass
 
 # 基本路径配置
 BASE_PATH = "/Users/jasonh/Desktop/02225_DRTS_Project/DRTS_Project-Test-Cases/7-unschedulable-test-case"  # 这里可以改成任何数据集文件夹路径
@@ -15,6 +16,97 @@ OUTPUT_DIR = "/Users/jasonh/Desktop/02225_DRTS_Project/output/7-unschedulable-te
 
 # 生成输出文件路径
 ANALYSIS_RESULT_PATH = os.path.join(OUTPUT_DIR, "analysis_result.csv")
+ALPHA_DELTA_CURVE_PATH = os.path.join(OUTPUT_DIR, "alpha_delta_curve.csv")
 RESOURCE_SUPPLY_PATH = os.path.join(OUTPUT_DIR, "resource_supply.csv")
 SOLUTION_PATH = os.path.join(OUTPUT_DIR, "solution.csv")
 PREPROCESSED_TASKS_PATH = os.path.join(OUTPUT_DIR, "preprocessed_tasks.csv")
+
+# 分析器并行度：1 = 串行，0 = 使用全部 CPU 核心（可被 analyzer.py --workers 覆盖）
+ANALYZER_WORKERS = 1
+# 仿真器按核心并行的进程数：1 = 串行，0 = 使用全部 CPU 核心（可被 simulate_full_auto.py --workers 覆盖）
+SIM_WORKERS = 1
+
+# 结果缓存：输入文件与参数不变时直接复用组件分析 / 仿真结果（main.py --no-cache 关闭）
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+CACHE_MAX_BYTES = 256 * 1024 * 1024   # 超过后按最近最少使用淘汰
+
+# tasks.csv 分块读取的行数：单块的解析内存与此成正比，百万级任务表也不会整表读入
+TASKS_CHUNK_ROWS = 200_000
+
+
+# --------------------------------------------------
+# 显式路径对象：各阶段函数通过它传参，批处理无需改写本文件
+# --------------------------------------------------
+@dataclass(frozen=True)
+class CasePaths:
+    base_path: str    # 数据集文件夹（tasks / architecture / budgets）
+    output_dir: str   # 该 case 的输出文件夹
+
+    @property
+    def case_name(self):
+        return os.path.basename(os.path.normpath(self.base_path))
+
+    @property
+    def tasks_path(self):
+        return os.path.join(self.base_path, "tasks.csv")
+
+    @property
+    def arch_path(self):
+        return os.path.join(self.base_path, "architecture.csv")
+
+    @property
+    def budgets_path(self):
+        return os.path.join(self.base_path, "budgets.csv")
+
+    @property
+    def analysis_result_path(self):
+        return os.path.join(self.output_dir, "analysis_result.csv")
+
+    @property
+    def alpha_delta_curve_path(self):
+        return os.path.join(self.output_dir, "alpha_delta_curve.csv")
+
+    @property
+    def resource_supply_path(self):
+        return os.path.join(self.output_dir, "resource_supply.csv")
+
+    @property
+    def solution_path(self):
+        return os.path.join(self.output_dir, "solution.csv")
+
+    @property
+    def rta_solution_path(self):
+        return os.path.join(self.output_dir, "rta_solution.csv")
+
+    @property
+    def mc_result_path(self):
+        return os.path.join(self.output_dir, "mc_result.csv")
+
+    @property
+    def trace_path(self):
+        return os.path.join(self.output_dir, "trace.bin")
+
+    @property
+    def preprocessed_tasks_path(self):
+        return os.path.join(self.output_dir, "preprocessed_tasks.csv")
+
+    @property
+    def preprocessed_npz_path(self):
+        return os.path.join(self.output_dir, "preprocessed.npz")
+
+    @property
+    def plot_dir(self):
+        return os.path.join(self.output_dir, "plots")
+
+    @property
+    def metrics_path(self):
+        return os.path.join(self.output_dir, "metrics.json")
+
+    @property
+    def profile_dir(self):
+        return os.path.join(self.output_dir, "profile")
+
+
+def current_paths():
+    """单独运行某个脚本时，使用本文件顶部 BASE_PATH / OUTPUT_DIR 指定的 case。"""
+    return CasePaths(BASE_PATH, OUTPUT_DIR)
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+import metrics
+
+"""dbf.py — 向量化 DBF (NumPy)
+--------------------------------------------------
+输入任务数组 C, T, D 与一组测试点 ts，一次性返回整条需求曲线，
+代替 analyzer.dbf_edf / dbf_rm 对每个 t 的逐点 Python 循环。
+逐任务需求按优先级顺序做累加 (cumsum)，与原循环的加法顺序一致，
+因此结果与标量版本逐位相同。
+
+qpa_edf：EDF 的精确可调度判定 (Zhang & Burns 的 Quick Processor-demand Analysis)，
+供给为 sbf(t) = α·(t − Δ)。从检查上界 L 往回只走截止期点，不需要逐个 t 扫描，
+也不受超周期大小影响。
+"""
+
+# 单次参与运算的 (任务 × 测试点) 元素上限，超过则按测试点分块
+CHUNK_ELEMS = 1 << 22
+
+
+def task_arrays(tasks):
+    """[(C,T,D), ...] → 三个 float64 数组 (C, T, D)。"""
+    arr = np.asarray(tasks, dtype=float).reshape(-1, 3)
+    return arr[:, 0], arr[:, 1], arr[:, 2]
+
+
+def demand_matrix(C, T, D, ts):
+    """逐任务需求矩阵，shape = (任务数, 测试点数)，第 i 行为 dbf_i(t)。"""
+    ts = np.asarray(ts, dtype=float)[None, :]
+    C, T, D = C[:, None], T[:, None], D[:, None]
+    n = np.floor((ts - D) / T) + 1
+    return np.where(ts >= D, n * C, 0.0)
+
+
+def _curve(C, T, D, ts, reduce):
+    ts = np.asarray(ts, dtype=float)
+    out = np.zeros(len(ts))
+    if len(C) == 0 or len(ts) == 0:
+        return out
+    step = max(1, CHUNK_ELEMS // len(C))
+    for lo in range(0, len(ts), step):
+        cum = np.cumsum(demand_matrix(C, T, D, ts[lo:lo + step]), axis=0)
+        out[lo:lo + step] = reduce(cum)
+    return out
+
+
+def dbf_edf_curve(C, T, D, ts):
+    """EDF：Σ_i dbf_i(t)。"""
+    return _curve(C, T, D, ts, lambda cum: cum[-1])
+
+
+def dbf_rm_curve(C, T, D, ts):
+    """RM/FPS：max_i Σ_{j≤i} dbf_j(t)，任务须已按优先级高→低排列。
+    每个优先级层的累计需求即 cumsum 的第 i 行，无需嵌套 j 循环。"""
+    return _curve(C, T, D, ts, lambda cum: np.maximum(cum.max(axis=0), 0.0))
+
+
+def dbf_curve(scheduler, tasks, ts):
+    """按调度器类型返回 ts 上的 DBF 曲线 (np.ndarray)。"""
+    C, T, D = task_arrays(tasks)
+    metrics.add(f"dbf.{scheduler.lower()}_evals", len(C) * len(ts))
+    if scheduler == "EDF":
+        return dbf_edf_curve(C, T, D, ts)
+    return dbf_rm_curve(C, T, D, ts)
+
+
+# --------------------------------------------------
+# QPA (EDF)
+# --------------------------------------------------
+QPA_EPS = 1e-9
+
+
+def dbf_at(C, T, D, t):
+    """单点 EDF 需求 Σ_i dbf_i(t)；t 恰为截止期时吸收浮点误差。"""
+    n = np.floor((t - D) / T + QPA_EPS) + 1
+    return float((np.maximum(n, 0.0) * C).sum())
+
+
+def qpa_bound(C, T, D, alpha=1.0, delta=0.0):
+    """只需检查 t < L 的截止期。
+    La: Σ U_i·(t + T_i − D_i) ≤ α(t − Δ) 之后 DBF 不可能再超过 SBF（要求 U < α）；
+    Lb: Δ = 0 时即为按 C/α 缩放后的同步 busy period。
+    两者都不可用时 (U ≥ α 且 Δ > 0，或 U > α) 返回 inf，必不可调度。"""
+    U = float((C / T).sum())
+    bounds = []
+    if U < alpha - QPA_EPS:
+        La = (float((C / T * (T - D)).sum()) + alpha * delta) / (alpha - U)
+        bounds.append(max(La, float(D.max())))
+    if delta == 0 and U <= alpha + QPA_EPS:
+        L = float(C.sum()) / alpha
+        while L < (bounds[0] if bounds else math.inf):   # 超过 La 后 Lb 已无用，不再迭代
+            L_new = float((np.ceil(L / T - QPA_EPS) * C).sum()) / alpha
+            if L_new <= L + QPA_EPS:
+                break
+            L = L_new
+        bounds.append(L)
+    return min(bounds) if bounds else math.inf
+
+
+def _last_deadline_before(T, D, t):
+    """max{ D_i + k·T_i < t }，不存在时返回 0。"""
+    k = np.ceil((t - D) / T - QPA_EPS) - 1
+    d = np.where(k >= 0, D + k * T, 0.0)
+    return float(d.max())
+
+
+def qpa_edf(tasks, alpha=1.0, delta=0.0):
+    """EDF 在供给 α(t − Δ) 下是否可调度：∀t, dbf(t) ≤ sbf(t)。
+    h(t) = Δ + dbf(t)/α (dbf(t) = 0 时取 0)，是只在截止期处跳变的非降阶梯，
+    于是检查 h(t) ≤ t 可按 QPA 从 L 往回迭代：
+        h(t) < t → t = h(t)；h(t) = t → t = 上一个截止期；h(t) > t → 不可调度
+    直到 h(t) ≤ min D。"""
+    C, T, D = task_arrays(tasks)
+    if len(C) == 0:
+        return True
+    L = qpa_bound(C, T, D, alpha, delta)
+    if math.isinf(L):
+        return False
+
+    def h(t):
+        demand = dbf_at(C, T, D, t)
+        return delta + demand / alpha if demand > 0 else 0.0
+
+    d_min = float(D.min())
+    t = _last_deadline_before(T, D, L)
+    ht = h(t)
+    steps = 1
+    while d_min < ht <= t + QPA_EPS:
+        t = ht if ht < t - QPA_EPS else _last_deadline_before(T, D, t)
+        ht = h(t)
+        steps += 1
+    metrics.add("qpa.calls")
+    metrics.add("qpa.steps", steps)
+    return ht <= d_min + QPA_EPS
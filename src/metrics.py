@@ -0,0 +1,130 @@
+import contextlib, cProfile, io, json, os, pstats, sys, time
+try:
+    import resource
+except ImportError:          # Windows 无 resource 模块，峰值内存记为 None
+    resource = None
+
+"""metrics.py — 计时 / 计数注册表
+--------------------------------------------------
+pipeline.run_case 在 collecting() 里跑完整个 case，各模块在热点处调用
+    metrics.add("dbf.rm_evals", n)          累加计数
+    with metrics.timer("analyze.plot"): …   累加耗时
+    metrics.record("cores", core_id, {...}) 记录逐组件 / 逐核心明细
+没有处于 collecting() 中时这些调用都是空操作，单独运行各脚本不受影响。
+计数只在批量运算处累加 (每条 DBF 曲线、每个核心一次)，不进入逐事件的内层循环。
+子进程 (并行组件分析) 各自 collecting()，把 as_dict() 送回主进程再 merge。
+stage() 记录阶段耗时与进程峰值内存 (ru_maxrss)，给定 profile_dir 时
+同时用 cProfile 采样该阶段，写出 <stage>.pstats 与按累计耗时排序的 <stage>.txt。
+"""
+
+PROFILE_TOP = 30   # <stage>.txt 中列出的函数个数
+
+_stack = []
+
+
+def peak_rss_mb():
+    """进程至今的峰值常驻内存 (MB)。"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024   # macOS 单位是字节，Linux 是 KB
+
+
+class Metrics:
+    def __init__(self):
+        self.stages = {}       # 阶段 → {seconds, peak_rss_mb}
+        self.timers = {}       # 名称 → 累计秒数
+        self.counters = {}     # 名称 → 累计计数
+        self.details = {}      # 分区 ("components" / "cores") → {键: {...}}
+
+    def add(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] = self.timers.get(name, 0.0) + time.perf_counter() - t0
+
+    def record(self, section, key, values):
+        self.details.setdefault(section, {}).setdefault(key, {}).update(values)
+
+    @contextlib.contextmanager
+    def stage(self, name, profile_dir=None):
+        prof = cProfile.Profile() if profile_dir else None
+        t0 = time.perf_counter()
+        if prof:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+                dump_profile(prof, profile_dir, name)
+            self.stages[name] = {"seconds": time.perf_counter() - t0, "peak_rss_mb": peak_rss_mb()}
+
+    def merge(self, data):
+        """合并另一个 Metrics.as_dict() (通常来自子进程)。"""
+        for name, n in data.get("counters", {}).items():
+            self.add(name, n)
+        for name, s in data.get("timers", {}).items():
+            self.timers[name] = self.timers.get(name, 0.0) + s
+        for section, entries in data.get("details", {}).items():
+            for key, values in entries.items():
+                self.record(section, key, values)
+
+    def as_dict(self):
+        return {"stages": self.stages, "timers": self.timers,
+                "counters": self.counters, "details": self.details}
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=1, ensure_ascii=False)
+
+
+def dump_profile(prof, profile_dir, name):
+    os.makedirs(profile_dir, exist_ok=True)
+    prof.dump_stats(os.path.join(profile_dir, f"{name}.pstats"))
+    buf = io.StringIO()
+    pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    with open(os.path.join(profile_dir, f"{name}.txt"), "w", encoding="utf-8") as f:
+        f.write(buf.getvalue())
+
+
+# --------------------------------------------------
+# 模块级入口：作用于当前 collecting() 的 Metrics，没有时为空操作
+# --------------------------------------------------
+@contextlib.contextmanager
+def collecting():
+    m = Metrics()
+    _stack.append(m)
+    try:
+        yield m
+    finally:
+        _stack.remove(m)
+
+
+def active():
+    return _stack[-1] if _stack else None
+
+
+def add(name, n=1):
+    if _stack:
+        _stack[-1].add(name, n)
+
+
+def timer(name):
+    return _stack[-1].timer(name) if _stack else contextlib.nullcontext()
+
+
+def record(section, key, values):
+    if _stack:
+        _stack[-1].record(section, key, values)
+
+
+def merge(data):
+    if _stack:
+        _stack[-1].merge(data)
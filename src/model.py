@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+import os
+
+"""model.py — 流水线各阶段之间传递的内存数据模型
+--------------------------------------------------
+System ─┬─ Core       (architecture.csv)
+        ├─ Component  (budgets.csv) ─ Task (tasks.csv，WCET 已按 speed_factor 折算)
+        │
+analyze → Interface   (组件级 α, Δ 与各项可调度标志)
+convert → SupplyTask  (Half‑Half 得到的 Q, P)
+各阶段直接传递这些对象；CSV 只在需要留档时由 records_to_csv 写出。
+"""
+
+
+@dataclass
+class Task:
+    name: str
+    component_id: str
+    core_id: str
+    wcet: float                      # 已除以 speed_factor
+    period: float
+    priority: Optional[int] = None   # 仅 RM 组件有意义，数值越小优先级越高
+    deadline: Optional[float] = None # 缺省 = period (implicit deadline)
+
+    def __post_init__(self):
+        if self.deadline is None:
+            self.deadline = self.period
+
+
+@dataclass
+class Component:
+    component_id: str
+    scheduler: str                   # 组件内调度器 RM / EDF
+    core_id: str
+    priority: Optional[int] = None   # 顶层 RM 用
+    alpha_budget: Optional[float] = None   # 父层预算 (budgets.csv 换算)
+    delta_budget: Optional[float] = None
+    tasks: list = field(default_factory=list)
+
+    def analysis_scheduler(self):
+        """解析分析 (analyzer / rta) 采用的组件内调度器：RM 组件有任务缺 priority，
+        或 period 越小 priority 不越高时，按最保守的 EDF 公式分析。"""
+        if self.scheduler != "RM":
+            return self.scheduler
+        by_period = [t.priority for t in sorted(self.tasks, key=lambda t: t.period)]
+        if None in by_period or any(a > b for a, b in zip(by_period, by_period[1:])):
+            return "EDF"
+        return "RM"
+
+
+@dataclass
+class Core:
+    core_id: str
+    speed_factor: float
+    scheduler: str                   # 顶层调度器 RM / EDF
+
+
+@dataclass
+class System:
+    cores: dict                      # core_id → Core
+    components: dict                 # component_id → Component（按 tasks.csv 中首次出现的顺序）
+
+    @property
+    def tasks(self):
+        return [t for c in self.components.values() for t in c.tasks]
+
+
+@dataclass
+class Interface:
+    component_id: str
+    core_id: str
+    scheduler: str
+    alpha: Optional[float]
+    delta: Optional[int]
+    schedulable: bool
+    core_overloaded: bool = False
+    system_schedulable: bool = False
+    interface_unsched: bool = False
+    budget_violate: Optional[bool] = None
+    case_schedulable: bool = False
+
+
+@dataclass
+class SupplyTask:
+    component_id: str
+    core_id: str
+    scheduler: str
+    Q: float
+    P: float
+    load: float
+
+
+def records_to_csv(records, path):
+    """把一组 dataclass 对象 (或 dict) 按字段顺序写成 CSV。"""
+    import pandas as pd   # 只有读写 CSV 时才需要 pandas，导入模型本身保持轻量
+    rows = [r if isinstance(r, dict) else asdict(r) for r in records]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def records_from_csv(cls, path):
+    """CSV → dataclass 对象列表（空值转为 None）。"""
+    import pandas as pd
+    df = pd.read_csv(path)
+    df = df.astype(object).where(df.notna(), None)
+    return [cls(**row) for row in df.to_dict("records")]
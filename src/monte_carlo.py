@@ -0,0 +1,156 @@
+import argparse, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+import simulate_full_auto as sfa
+from model import SupplyTask, System, records_from_csv, records_to_csv
+
+"""monte_carlo.py — 随机化仿真 (Monte Carlo)
+--------------------------------------------------
+确定性仿真只覆盖一个场景：t=0 同步释放、每个 job 恰好执行 WCET。
+这里跑 N 个副本，每个副本：
+    • 执行时间按分布采样 ("uniform": [BCET, WCET] 均匀，BCET = MC_BCET_RATIO · WCET；"wcet": 固定 WCET)
+    • 每个任务随机相位 offset ∈ [0, period)（可关闭）
+副本在进程池中并行，各自使用 SeedSequence.spawn 派生的独立随机流，结果可复现。
+System / 供给任务只在每个 worker 初始化时传入一次，副本之间共享，
+单个副本的开销只剩运行时状态构建 + 仿真本身。
+响应时间用直方图 (桶宽 MC_HIST_WIDTH) 跨副本合并，内存与副本数、仿真时长无关。
+输出每个任务的 p50 / p99 / max 响应时间与 miss 概率 → mc_result.csv
+"""
+
+MC_REPLICAS     = 100
+MC_SEED         = 2025
+MC_EXEC_DIST    = "uniform"
+MC_BCET_RATIO   = 0.5
+MC_HYPERPERIODS = 3       # 执行时间随机时不会进入稳态，每个副本固定仿真的超周期数
+MC_HIST_WIDTH   = 0.01    # 响应时间直方图桶宽 (TU)，百分位取桶上界 (不超过观测到的最大值)
+SAMPLE_BLOCK    = 1024    # 执行时间一次批量采样的个数
+
+_shared = {}   # worker 内共享的只读模型
+
+
+class ExecSampler:
+    """按块批量采样的执行时间序列，每次调用返回下一个值。"""
+    __slots__ = ("rng", "lo", "hi", "buf", "pos")
+
+    def __init__(self, rng, lo, hi):
+        self.rng, self.lo, self.hi = rng, lo, hi
+        self.buf, self.pos = [], 0
+
+    def __call__(self):
+        if self.pos == len(self.buf):
+            self.buf = self.rng.uniform(self.lo, self.hi, SAMPLE_BLOCK).tolist()
+            self.pos = 0
+        self.pos += 1
+        return self.buf[self.pos - 1]
+
+
+def _init_worker(system, supplies, params):
+    _shared.update(system=system, supplies=supplies, params=params)
+
+
+def run_replica(seed_seq):
+    """单个副本：返回 {component_id: [(jobs, misses, rt_max, rt_hist), ...按任务顺序]}。"""
+    p = _shared["params"]
+    rng = np.random.default_rng(seed_seq)
+    components, cores = sfa.build_components(_shared["system"], _shared["supplies"],
+                                             hist_width=MC_HIST_WIDTH, verbose=False)
+    for comp in components.values():
+        for task in comp.tasks:
+            if p["random_offsets"]:
+                task.offset = float(rng.uniform(0.0, task.period))
+            if p["dist"] == "uniform":
+                task.exec_time = ExecSampler(rng, p["bcet_ratio"] * task.wcet, task.wcet)
+            elif p["dist"] != "wcet":
+                raise ValueError(f"未知执行时间分布: {p['dist']}")
+    for core_id, core in cores.items():
+        sfa.run_core(core_id, core, p["max_time"], max_hyperperiods=p["hyperperiods"], steady_check=False)
+    return {cid: [(t.job, t.miss_cnt, t.rt_max, t.rt_hist) for t in comp.tasks]
+            for cid, comp in components.items()}
+
+
+def _percentile(hist, total, q, rt_max):
+    """直方图 → 第 q 分位（取所在桶上界，偏保守）。
+    最高的桶上界可能超过真实最大值，所以结果截到观测到的 rt_max，保证 p50 ≤ p99 ≤ rt_max。"""
+    acc = 0
+    for b in sorted(hist):
+        acc += hist[b]
+        if acc >= q * total:
+            return min((b + 1) * MC_HIST_WIDTH, rt_max)
+    return float("nan")
+
+
+def monte_carlo(system: System, supplies, replicas=MC_REPLICAS, workers=1, seed=MC_SEED,
+                dist=MC_EXEC_DIST, bcet_ratio=MC_BCET_RATIO, random_offsets=True,
+                hyperperiods=MC_HYPERPERIODS, max_time=sfa.MAX_SIM_TIME):
+    """跑 replicas 个随机副本，返回每个任务一行的汇总 DataFrame。"""
+    import pandas as pd   # 只有汇总结果时才需要 pandas，worker 导入本模块保持轻量
+    workers = workers or os.cpu_count() or 1
+    params = dict(dist=dist, bcet_ratio=bcet_ratio, random_offsets=random_offsets,
+                  hyperperiods=hyperperiods, max_time=max_time)
+    seeds = np.random.SeedSequence(seed).spawn(replicas)
+    print(f"=== Monte Carlo: replicas={replicas} workers={workers} dist={dist} "
+          f"offsets={'random' if random_offsets else 'sync'} seed={seed} ===")
+
+    t0 = time.perf_counter()
+    if workers > 1 and replicas > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(system, supplies, params)) as pool:
+            outs = list(pool.map(run_replica, seeds, chunksize=max(1, replicas // (4 * workers))))
+    else:
+        _init_worker(system, supplies, params)
+        outs = [run_replica(s) for s in seeds]
+    print(f"    {replicas} replicas in {time.perf_counter() - t0:.2f}s")
+
+    rows = []
+    for cid, comp in system.components.items():
+        if cid not in outs[0]:
+            continue
+        for ti, task in enumerate(comp.tasks):
+            per_rep = [out[cid][ti] for out in outs]
+            hist = {}
+            for _, _, _, h in per_rep:
+                for b, n in h.items():
+                    hist[b] = hist.get(b, 0) + n
+            n_done = sum(hist.values())
+            jobs = sum(r[0] for r in per_rep)
+            misses = sum(r[1] for r in per_rep)
+            rt_max = max(r[2] for r in per_rep)
+            rows.append({
+                "task_name"        : task.name,
+                "component_id"     : cid,
+                "replicas"         : replicas,
+                "jobs"             : jobs,
+                "miss_ratio"       : misses / jobs if jobs else 0.0,           # 每个 job 的 miss 概率
+                "replica_miss_prob": sum(r[1] > 0 for r in per_rep) / replicas, # 一次运行中出现 miss 的概率
+                "rt_p50"           : _percentile(hist, n_done, 0.50, rt_max) if n_done else 0.0,
+                "rt_p99"           : _percentile(hist, n_done, 0.99, rt_max) if n_done else 0.0,
+                "rt_max"           : rt_max,
+            })
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Monte Carlo 随机化仿真")
+    ap.add_argument("--replicas", type=int, default=MC_REPLICAS)
+    ap.add_argument("--workers", type=int, default=config.SIM_WORKERS,
+                    help="并行副本的进程数 (1=串行, 0=全部 CPU 核心)")
+    ap.add_argument("--seed", type=int, default=MC_SEED)
+    ap.add_argument("--dist", choices=["uniform", "wcet"], default=MC_EXEC_DIST)
+    ap.add_argument("--bcet-ratio", type=float, default=MC_BCET_RATIO)
+    ap.add_argument("--sync", action="store_true", help="不加随机相位，全部任务 t=0 同步释放")
+    args = ap.parse_args(argv)
+
+    import preprocess_data
+    paths = config.current_paths()
+    system = preprocess_data.load_system(paths)
+    supplies = records_from_csv(SupplyTask, paths.resource_supply_path)
+    df = monte_carlo(system, supplies, args.replicas, args.workers, args.seed,
+                     args.dist, args.bcet_ratio, not args.sync)
+    records_to_csv(df.to_dict("records"), paths.mc_result_path)
+    print(df.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n✅ Monte Carlo 结果写入 {paths.mc_result_path}")
+
+
+if __name__ == "__main__":
+    main()
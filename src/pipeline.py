@@ -0,0 +1,150 @@
+import contextlib, io, os, traceback
+from concurrent.futures import ProcessPoolExecutor
+import config
+import cache
+import metrics
+import timebase
+import analyzer, sim, simulate_full_auto, rta
+
+"""pipeline.py — 进程内流水线
+--------------------------------------------------
+单个 case：preprocess → analyze → Half‑Half → simulate → check，
+各阶段直接调用函数，阶段之间传递 model.py 中的内存对象
+(System → Interface → SupplyTask → solution 行)，不做 CSV 往返；
+CSV 产物只在最后按需 (write_csv) 一次性写出。
+use_rta 时用 rta.py 的解析 WCRT 代替仿真生成 solution 行。
+use_cache 时组件分析结果与整个 case 的仿真结果走 cache.ResultCache，
+输入文件与参数都没变就直接复用；预处理阶段同样优先读 preprocessed.npz。
+plots 为 "png" / "pdf" 时分析阶段把 DBF 曲线延伸到绘图时限，并在最后追加 plot 阶段直接用它出图；
+默认不画图，批量运行不为 matplotlib 付出任何开销。
+pandas 只在读写表格的阶段 (preprocess / check / write_csv) 才加载，import pipeline 本身不依赖它。
+每个 case 在 metrics.collecting() 中运行：阶段耗时 / 峰值内存、各模块的计数与计时、
+逐组件 / 逐核心明细写入 <output_dir>/metrics.json；profile 时每个阶段另有 cProfile 结果。
+多个 case 之间互不依赖，run_batch 用进程池并发执行，
+汇总表由返回的 dict 组装，而不是从 stdout 抓 [SUMMARY] 行。
+"""
+
+
+def write_artifacts(paths, system, interfaces, curve_df, supplies, rows):
+    import preprocess_data
+    preprocess_data.write_preprocessed(system, paths.preprocessed_tasks_path)
+    analyzer.write_results(interfaces, curve_df, paths)
+    sim.write_supplies(supplies, paths.resource_supply_path)
+    simulate_full_auto.write_solution(rows, paths.solution_path)
+
+
+def case_key(paths):
+    """仿真缓存键：三个输入文件的内容 + 分析 / 仿真参数 + 仿真语义版本。"""
+    files = tuple(cache.file_digest(p) for p in (paths.tasks_path, paths.arch_path, paths.budgets_path))
+    sim_params = (simulate_full_auto.SIM_SEMANTICS_VERSION,
+                  simulate_full_auto.MAX_SIM_TIME, simulate_full_auto.MAX_HYPERPERIODS,
+                  timebase.TIME_DENOM_MAX, simulate_full_auto.EPS,
+                  simulate_full_auto.RT_HIST_WIDTH)
+    return cache.digest("sim", files, analyzer.analyzer_params(), sim_params)
+
+
+def simulate_cached(system, supplies, key, result_cache, trace_path=None, workers=1):
+    """trace_path 非 None 时必须真正仿真才能得到轨迹，不读缓存。"""
+    rows = result_cache.get("sim", key) if result_cache and trace_path is None else None
+    if rows is not None:
+        print("♻️ 仿真结果命中缓存，跳过仿真")
+        return rows
+    rows = simulate_full_auto.simulate_system(system, supplies, trace_path=trace_path, workers=workers)
+    if result_cache:
+        result_cache.put("sim", key, rows)
+    return rows
+
+
+def preprocess_stage(paths, use_cache):
+    import preprocess_data   # CSV / npz 读入依赖 pandas，只在真正运行时加载
+    return preprocess_data.load_system(paths, use_cache)
+
+
+def check_stage(paths, rows):
+    import pandas as pd
+    import check_solution
+    return check_solution.check(pd.DataFrame(rows), paths.case_name)
+
+
+def plot_stage(paths, st, plot_workers, fmt):
+    import plot_dbf   # 只有需要出图时才加载 matplotlib
+    plot_dbf.plot_system(st["system"], st["interfaces"], st["curves"], paths.plot_dir, plot_workers, fmt)
+
+
+def run_case(case_dir, output_dir, analyzer_workers=1, write_csv=True, use_cache=True, trace=False,
+             sim_workers=1, use_rta=False, profile=False, plots=None, plot_workers=1):
+    """跑完一个 case 的全部阶段。
+    阶段日志写入 <output_dir>/run.log，指标写入 <output_dir>/metrics.json；返回 dict:
+        case, ok, summary, report, timings{阶段: 秒}, metrics, error, log_path
+    """
+    paths = config.CasePaths(str(case_dir), str(output_dir))
+    os.makedirs(paths.output_dir, exist_ok=True)
+    result = {"case": paths.case_name, "ok": False, "summary": None, "report": "",
+              "timings": {}, "metrics": None, "error": None,
+              "log_path": os.path.join(paths.output_dir, "run.log")}
+
+    result_cache = cache.ResultCache(config.CACHE_DIR, config.CACHE_MAX_BYTES) if use_cache else None
+    st = {}
+    stages = [
+        ("preprocess", lambda: st.update(system=preprocess_stage(paths, use_cache))),
+        ("analyze",    lambda: st.update(zip(("interfaces", "curve_df", "curves"),
+                                             analyzer.analyze_system(st["system"], analyzer_workers,
+                                                                     result_cache, bool(plots))))),
+        ("half_half",  lambda: st.update(supplies=sim.convert_system(st["system"], st["interfaces"]))),
+        ("simulate",   lambda: st.update(rows=simulate_cached(st["system"], st["supplies"],
+                                                              case_key(paths) if use_cache else None,
+                                                              result_cache,
+                                                              paths.trace_path if trace else None,
+                                                              sim_workers))),
+        ("rta",        lambda: st.update(rows=rta.rta_system(st["system"], st["interfaces"]))),
+        ("check",      lambda: st.update(zip(("report", "summary"), check_stage(paths, st["rows"])))),
+    ]
+    stages = [s for s in stages if s[0] != ("simulate" if use_rta else "rta")]
+    if write_csv:
+        stages.append(("write_csv", lambda: write_artifacts(
+            paths, st["system"], st["interfaces"], st["curve_df"], st["supplies"], st["rows"])))
+    if plots:
+        stages.append(("plot", lambda: plot_stage(paths, st, plot_workers, plots)))
+
+    log = io.StringIO()
+    profile_dir = paths.profile_dir if profile else None
+    with contextlib.redirect_stdout(log), metrics.collecting() as m:
+        try:
+            for name, stage in stages:
+                print(f"\n▶ 运行：{name}")
+                with m.stage(name, profile_dir):
+                    stage()
+                result["timings"][name] = m.stages[name]["seconds"]
+            result["report"], result["summary"] = st["report"], st["summary"]
+            result["ok"] = result["summary"] is not None
+        except Exception:
+            result["error"] = traceback.format_exc()
+            print(result["error"])
+    result["metrics"] = m.as_dict()
+    m.write(paths.metrics_path)
+
+    with open(result["log_path"], "w", encoding="utf-8") as f:
+        f.write(log.getvalue())
+    return result
+
+
+def run_batch(case_dirs, output_root, jobs=1, analyzer_workers=1, write_csv=True, use_cache=True,
+              trace=False, sim_workers=1, use_rta=False, profile=False, plots=None, plot_workers=1):
+    """并发运行多个 case，返回与 case_dirs 同顺序的结果列表。"""
+    case_dirs = [str(d) for d in case_dirs]
+    out_dirs = [os.path.join(str(output_root), os.path.basename(os.path.normpath(d))) for d in case_dirs]
+    workers = [analyzer_workers] * len(case_dirs)
+    writes = [write_csv] * len(case_dirs)
+    caches = [use_cache] * len(case_dirs)
+    traces = [trace] * len(case_dirs)
+    sim_workers = [sim_workers] * len(case_dirs)
+    rtas = [use_rta] * len(case_dirs)
+    profiles = [profile] * len(case_dirs)
+    plots = [plots] * len(case_dirs)
+    plot_workers = [plot_workers] * len(case_dirs)
+    args = (case_dirs, out_dirs, workers, writes, caches, traces, sim_workers, rtas, profiles,
+            plots, plot_workers)
+    if jobs > 1 and len(case_dirs) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(run_case, *args))
+    return [run_case(*a) for a in zip(*args)]
@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+import analyzer
+
+"""plot_dbf.py — dbf vs sbf 绘图 (独立阶段，按需开启)
+--------------------------------------------------
+直接使用 analyzer.analyze_system(..., plots=True) 返回的 DBF 阶梯曲线 (已延伸到绘图时限)，不重算需求；
+分析阶段不再画图，不出图时也不为绘图时限多算曲线。
+每张图用面向对象的 Figure + 非交互 Agg 后端绘制，不经过 pyplot 的全局状态，
+因此可以放进进程池并行渲染：
+    fmt="png"  每个可调度组件一张 <component>_dbf_vs_sbf.png (workers > 1 时并行)
+    fmt="pdf"  全部组件合并为一个多页 dbf_vs_sbf.pdf
+"""
+
+PLOT_FORMATS = ("png", "pdf")
+PDF_NAME = "dbf_vs_sbf.pdf"
+
+
+def plot_jobs(system, interfaces, curves):
+    """可调度组件 → [(component_id, scheduler, (测试点, DBF), α, Δ, 绘图时限), ...]"""
+    jobs = []
+    for r in interfaces:
+        if not r.schedulable:
+            continue
+        comp = system.components[r.component_id]
+        max_t = max(t.period for t in comp.tasks) * analyzer.TEST_HORIZON_FACTOR
+        jobs.append((r.component_id, comp.scheduler, curves[r.component_id], r.alpha, r.delta, max_t))
+    return jobs
+
+
+def draw(job):
+    comp_id, scheduler, (curve_t, curve_d), alpha, delta, max_t = job
+    keep = curve_t <= max_t
+    ts = np.concatenate(([0.0], curve_t[keep], [max_t]))
+    dbfs = np.concatenate(([0.0], curve_d[keep], [curve_d[keep][-1] if keep.any() else 0.0]))
+    sbf_t = np.array([0.0, delta, max_t]) if delta < max_t else np.array([0.0, max_t])
+    sbfs = np.maximum(0.0, alpha * (sbf_t - delta))
+
+    fig = Figure()
+    ax = fig.add_subplot()
+    ax.step(ts, dbfs, where="post", label="DBF", linewidth=2)
+    ax.plot(sbf_t, sbfs, label="SBF", linestyle="--", linewidth=2)
+    ax.set_xlabel("Time (t)")
+    ax.set_ylabel("Resource Demand / Supply")
+    ax.set_title(f"{comp_id} ({scheduler})")
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+
+def render_png(job, plot_dir):
+    out_path = os.path.join(plot_dir, f"{job[0]}_dbf_vs_sbf.png")
+    draw(job).savefig(out_path)
+    return out_path
+
+
+def render_plots(jobs, plot_dir, workers=1, fmt="png"):
+    """渲染全部图像，返回写出的文件列表。"""
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"未知绘图格式: {fmt}")
+    if not jobs:
+        return []
+    os.makedirs(plot_dir, exist_ok=True)
+    if fmt == "pdf":
+        out_path = os.path.join(plot_dir, PDF_NAME)
+        with PdfPages(out_path) as pdf:
+            for job in jobs:
+                pdf.savefig(draw(job))
+        return [out_path]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(render_png, jobs, [plot_dir] * len(jobs),
+                                 chunksize=max(1, len(jobs) // (4 * workers))))
+    return [render_png(job, plot_dir) for job in jobs]
+
+
+def plot_system(system, interfaces, curves, plot_dir, workers=1, fmt="png"):
+    workers = workers or os.cpu_count() or 1
+    outs = render_plots(plot_jobs(system, interfaces, curves), plot_dir, workers, fmt)
+    print(f"📊 {len(outs)} plot file(s) written to {plot_dir} (fmt={fmt}, workers={workers})")
+    return outs
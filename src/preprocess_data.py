@@ -1,68 +1,402 @@
 #!/usr/bin/env python3
 """
-preprocess_data.py  —  生成单一任务表  preprocessed_tasks.csv
-路径全部取自用户自定义的 config.py：
-    TASKS_PATH, BUDGETS_PATH, ARCH_PATH, PREPROCESSED_TASKS_PATH
+preprocess_data.py  —  读取原始输入，构建内存模型 model.System
+（可选）导出单一任务表  preprocessed_tasks.csv
+路径由 config.CasePaths 显式传入；单独运行时取 config.py 中的 BASE_PATH / OUTPUT_DIR：
+    tasks_path, budgets_path, arch_path, preprocessed_tasks_path
+
+tasks.csv 按 config.TASKS_CHUNK_ROWS 行分块读取：显式紧凑 dtype (component_id 为 categorical，
+priority 为 Int32)，逐块校验并报告出错行号，每块直接生成 Task 挂到组件上，不拼整张任务表；
+缺省的 RM 优先级在读完后用一次 lexsort 按组件编密集秩补齐。
+
+load_system 在 build_system 之外加了一层二进制缓存 preprocessed.npz (列式 NumPy 数组)：
+    任务   task_name / task_comp(组件编码) / wcet(已折算) / period / deadline / task_priority
+    组件   comp_id / comp_scheduler / comp_core(核心编码) / comp_priority / alpha_budget / delta_budget
+    核心   core_id / speed_factor / core_scheduler
+可空的整数 / 浮点列用 NaN 表示 None；文件里同时存三个输入 CSV 的内容哈希，
+输入没变就直接从 npz 还原 System，不再经过 pandas 解析与 speed_factor 折算。
+读取时各列按偏移做只读内存映射 (零拷贝)，Task 对象按组件惰性生成 (LazyTasks)。
 """
+import os, struct, tempfile, zipfile
+from collections.abc import Sequence
+import numpy as np
 import pandas as pd
 from pathlib import Path
+import cache
 import config   # ← 你现有的配置模块
+import metrics
+from model import Task, Component, Core, System
 
 
 # ────────────────────────── 工具 ──────────────────────────
-def dense_rm_rank(series: pd.Series) -> pd.Series:
-    return series.rank(method="dense", ascending=True).astype(int) - 1
-
-
 def must_have(df: pd.DataFrame, cols: list, name: str):
     miss = df[cols].isna().any()
     if miss.any():
         raise ValueError(f"{name} 缺失必填列: {miss[miss].index.tolist()}")
 
 
+def budget_interfaces(budgets: pd.DataFrame) -> dict:
+    """budgets.csv → {component_id: (alpha_budget, delta_budget)}，供父预算覆盖检查。
+    支持 (budget, period) 表头自动换算，以及 alpha_budget / delta_budget 及 id 列别名。"""
+    # ---------- ① 若文件是 (budget, period) 表头，先换算出 alpha_budget, delta_budget ----------
+    if {"budget", "period"}.issubset(budgets.columns):
+        budgets = budgets.copy()
+        budgets["alpha_budget"] = budgets["budget"] / budgets["period"]
+        budgets["delta_budget"] = budgets["period"] - budgets["budget"]
+
+    # ---------- ② 别名兼容（含刚刚换算出的列） ----------
+    alias = {
+        "component_id": {"component_id", "comp_id", "cid"},
+        "alpha_budget": {"alpha_budget"},
+        "delta_budget": {"delta_budget"},
+    }
+    colmap = {}
+    for std, cand in alias.items():
+        for col in budgets.columns:
+            if col.lower() in {x.lower() for x in cand}:
+                colmap[std] = col
+                break
+
+    missing = [std for std in alias if std not in colmap]
+    if missing:
+        print(f"\n❌ budgets.csv 缺字段 {missing} → 覆盖检查被跳过")
+        return {}
+    return {row[0]: (row[1], row[2]) for row in budgets[[colmap["component_id"],
+                                                         colmap["alpha_budget"],
+                                                         colmap["delta_budget"]]].itertuples(index=False)}
+
+
+# ────────────────────────── 分块读取 tasks.csv ──────────────────────────
+# 显式的紧凑 dtype：component_id 用 categorical (每行只存一个整数编码)，priority 用可空 Int32；
+# wcet / period 保持 float64 —— 它们会被 timebase 还原成精确分数，降到 float32 会改变超周期与分析结果。
+TASK_COLUMNS  = ("task_name", "wcet", "period", "component_id", "priority")
+TASK_REQUIRED = ["task_name", "wcet", "period", "component_id"]
+TASK_DTYPES   = {"task_name": str, "wcet": "float64", "period": "float64",
+                 "component_id": str, "priority": "Int32"}
+
+
+def validate_chunk(chunk: pd.DataFrame, first_row: int, known_components: pd.Index):
+    """逐块校验 tasks.csv；出错时报告原文件中的行号 (表头为第 1 行)。"""
+    checks = {
+        "缺失必填列":                   chunk[TASK_REQUIRED].isna().any(axis=1),
+        "wcet < 0":                     chunk["wcet"] < 0,
+        "period <= 0":                  chunk["period"] <= 0,
+        "component_id 不在 budgets.csv": chunk["component_id"].notna()
+                                         & ~chunk["component_id"].isin(known_components),
+    }
+    for why, mask in checks.items():
+        if mask.any():
+            rows = (np.flatnonzero(mask.to_numpy()) + first_row + 2)[:5].tolist()
+            raise ValueError(f"tasks.csv {why}: 第 {rows} 行" + (" 等" if mask.sum() > 5 else ""))
+
+
+def read_tasks(paths: config.CasePaths, comp_ids: pd.Series, comp_speed: np.ndarray,
+               chunk_rows=config.TASKS_CHUNK_ROWS):
+    """分块读取 tasks.csv，逐块校验、折算 wcet 后产出
+    (组件编码 ndarray, task_name, wcet, period, priority)，后四列为 Python 列表，priority 缺省为 None。
+    调用方逐块消费；读完一块就丢掉它，整张表从不同时驻留内存。"""
+    comp_dtype = pd.CategoricalDtype(comp_ids)
+    first_row = 0
+    reader = pd.read_csv(paths.tasks_path, usecols=lambda c: c in TASK_COLUMNS,
+                         dtype=TASK_DTYPES, chunksize=chunk_rows)
+    with reader:
+        for chunk in reader:
+            if "priority" not in chunk:
+                chunk["priority"] = pd.array([pd.NA] * len(chunk), dtype="Int32")
+            validate_chunk(chunk, first_row, comp_dtype.categories)
+            first_row += len(chunk)
+            code = pd.Categorical(chunk["component_id"], dtype=comp_dtype).codes
+            yield (code, chunk["task_name"].tolist(),
+                   (chunk["wcet"].to_numpy() / comp_speed[code]).tolist(),   # WCET 折算
+                   chunk["period"].tolist(),
+                   chunk["priority"].to_numpy(dtype=object, na_value=None).tolist())
+    if not first_row:
+        raise ValueError("tasks.csv 没有任务")
+
+
 # ────────────────────────── 预处理 ──────────────────────────
-def main():
-    # 1. 读取原始 CSV
-    tasks   = pd.read_csv(config.TASKS_PATH)
-    budgets = pd.read_csv(config.BUDGETS_PATH)
-    arch    = pd.read_csv(config.ARCH_PATH)
+def _opt_int(v):
+    return None if pd.isna(v) else int(v)
+
 
-    must_have(tasks,   ["task_name", "wcet", "period", "component_id"],          "tasks.csv")
+def dense_rm_rank(code: np.ndarray, period: np.ndarray) -> np.ndarray:
+    """按组件编码分组，周期越短优先级越高 (组内密集秩，0 起)；一次 lexsort，不逐组件循环。"""
+    order = np.lexsort((period, code))
+    c, p = code[order], period[order]
+    new_comp = np.r_[True, c[1:] != c[:-1]]
+    step = np.cumsum(new_comp | np.r_[True, p[1:] != p[:-1]])
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = step - np.maximum.accumulate(np.where(new_comp, step, 0))
+    return rank
+
+
+def build_system(paths: config.CasePaths, chunk_rows=config.TASKS_CHUNK_ROWS) -> System:
+    """原始 CSV → model.System（组件按 tasks.csv 中首次出现的顺序排列）。
+    tasks.csv 每读入一块就直接生成 Task 挂到所属组件上，不先拼出整张任务表；
+    峰值内存 ≈ 最终的 System + 一块的临时列。"""
+    # budgets / architecture 很小，整表读入
+    budgets = pd.read_csv(paths.budgets_path)
+    arch    = pd.read_csv(paths.arch_path)
     must_have(budgets, ["component_id", "scheduler", "core_id"],                 "budgets.csv")
     must_have(arch,    ["core_id", "speed_factor"],                              "architecture.csv")
 
-    # 2. component → core,  core → speed_factor
-    tasks["core_id"] = tasks["component_id"].map(
-        budgets.set_index("component_id")["core_id"]
-    )
-    tasks["speed_factor"] = tasks["core_id"].map(
-        arch.set_index("core_id")["speed_factor"]
-    )
-
-    # 3. WCET 折算
-    tasks["wcet"] = tasks["wcet"] / tasks["speed_factor"]
-
-    # 4. 合并调度器类型
-    tasks["scheduler"] = tasks["component_id"].map(
-        budgets.set_index("component_id")["scheduler"].str.upper()
-    )
-
-    # 5. 自动补齐 RM priority
-    mask_rm = tasks["scheduler"].eq("RM") & tasks["priority"].isna()
-    for cid, sub in tasks[mask_rm].groupby("component_id"):
-        tasks.loc[sub.index, "priority"] = dense_rm_rank(sub["period"])
-    tasks["priority"] = tasks["priority"].astype("Int64")
-
-    # 6. 选列并保存
-    final = tasks[[
-        "component_id", "scheduler", "core_id",
-        "task_name", "wcet", "period", "priority"
-    ]]
-
-    out_path = Path(config.PREPROCESSED_TASKS_PATH)
+    cores = {
+        row.core_id: Core(row.core_id, float(row.speed_factor), str(row.scheduler).strip().upper())
+        for row in arch.itertuples(index=False)
+    }
+    # 组件属性事先按 budgets.csv 的行序编成列表 / 数组，逐块只按组件编码取值，不走 pandas 索引
+    comps      = budgets.drop_duplicates("component_id")
+    comp_ids   = comps["component_id"].tolist()
+    comp_sched = [str(s).strip().upper() for s in comps["scheduler"].tolist()]
+    comp_core  = comps["core_id"].tolist()
+    comp_prio  = comps["priority"].tolist() if "priority" in comps else [None] * len(comps)
+    comp_speed = comps["core_id"].map(arch.drop_duplicates("core_id").set_index("core_id")["speed_factor"]) \
+                                 .to_numpy(dtype=float)
+    comp_rm    = np.array([s == "RM" for s in comp_sched], dtype=bool)
+    bdg = budget_interfaces(budgets)
+
+    components, by_code = {}, [None] * len(comp_ids)
+    # RM 组件里缺省 priority 的任务：先记下 (Task, 组件编码, 周期)，全部读完后一次补齐
+    rm_tasks, rm_code, rm_period = [], [], []
+    n_tasks = 0
+    with metrics.timer("preprocess.read_csv"):
+        for code, names, wcets, periods, prios in read_tasks(paths, comps["component_id"], comp_speed, chunk_rows):
+            block = []
+            for ci, name, wcet, period, prio in zip(code.tolist(), names, wcets, periods, prios):
+                comp = by_code[ci]
+                if comp is None:
+                    cid = comp_ids[ci]
+                    a_bud, d_bud = bdg.get(cid, (None, None))
+                    comp = by_code[ci] = components[cid] = Component(
+                        component_id=cid,
+                        scheduler=comp_sched[ci],
+                        core_id=comp_core[ci],
+                        priority=_opt_int(comp_prio[ci]),
+                        alpha_budget=a_bud,
+                        delta_budget=d_bud,
+                    )
+                task = Task(name=name, component_id=comp.component_id, core_id=comp.core_id,
+                            wcet=wcet, period=period, priority=prio)
+                comp.tasks.append(task)
+                block.append(task)
+            n_tasks += len(block)
+            missing = comp_rm[code] & np.array([p is None for p in prios], dtype=bool)
+            if missing.any():
+                rows = np.flatnonzero(missing)
+                rm_tasks.extend(block[i] for i in rows.tolist())
+                rm_code.append(code[rows])
+                rm_period.append(np.asarray(periods, dtype=float)[rows])
+
+    # 自动补齐 RM priority：按组件给缺省优先级的任务编密集秩
+    if rm_tasks:
+        ranks = dense_rm_rank(np.concatenate(rm_code), np.concatenate(rm_period)).tolist()
+        for task, rank in zip(rm_tasks, ranks):
+            task.priority = rank
+    print(f"✅ 预处理完成：cores={len(cores)}, components={len(components)}, tasks={n_tasks}")
+    return System(cores=cores, components=components)
+
+
+def load_tasks(paths: config.CasePaths) -> pd.DataFrame:
+    """读取并折算任务表，返回 preprocessed_tasks.csv 的各列。"""
+    return tasks_frame(build_system(paths))
+
+
+def tasks_frame(system: System) -> pd.DataFrame:
+    """System → preprocessed_tasks.csv 的表格形式。"""
+    return pd.DataFrame([{
+        "component_id": t.component_id,
+        "scheduler": system.components[t.component_id].scheduler,
+        "core_id": t.core_id,
+        "task_name": t.name,
+        "wcet": t.wcet,
+        "period": t.period,
+        "priority": t.priority,
+    } for t in system.tasks]).astype({"priority": "Int64"})
+
+
+def write_preprocessed(system: System, path):
+    out_path = Path(path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    final.to_csv(out_path, index=False)
-    print(f"✅ 预处理完成 → {out_path}")
+    tasks_frame(system).to_csv(out_path, index=False)
+    print(f"✅ 预处理结果 → {out_path}")
+
+
+# ────────────────────────── 二进制缓存 (.npz) ──────────────────────────
+NPZ_VERSION = 1
+
+
+def inputs_digest(paths: config.CasePaths):
+    return cache.digest("npz", NPZ_VERSION,
+                        *(cache.file_digest(p) for p in (paths.tasks_path, paths.budgets_path, paths.arch_path)))
+
+
+def _opt(v):
+    return np.nan if v is None else v
+
+
+def system_arrays(system: System) -> dict:
+    """System → 列式数组 (组件 / 核心用整数编码引用)。"""
+    core_ids = list(system.cores)
+    comp_ids = list(system.components)
+    core_code = {cid: i for i, cid in enumerate(core_ids)}
+    comps = list(system.components.values())
+    tasks = system.tasks
+    comp_code = {cid: i for i, cid in enumerate(comp_ids)}
+    return {
+        "core_id":        np.array(core_ids, dtype=str),
+        "speed_factor":   np.array([c.speed_factor for c in system.cores.values()], dtype=float),
+        "core_scheduler": np.array([c.scheduler for c in system.cores.values()], dtype=str),
+        "comp_id":        np.array(comp_ids, dtype=str),
+        "comp_scheduler": np.array([c.scheduler for c in comps], dtype=str),
+        "comp_core":      np.array([core_code.get(c.core_id, -1) for c in comps], dtype=np.int32),
+        "comp_priority":  np.array([_opt(c.priority) for c in comps], dtype=float),
+        "alpha_budget":   np.array([_opt(c.alpha_budget) for c in comps], dtype=float),
+        "delta_budget":   np.array([_opt(c.delta_budget) for c in comps], dtype=float),
+        "task_name":      np.array([t.name for t in tasks], dtype=str),
+        "task_comp":      np.array([comp_code[t.component_id] for t in tasks], dtype=np.int32),
+        "wcet":           np.array([t.wcet for t in tasks], dtype=float),
+        "period":         np.array([t.period for t in tasks], dtype=float),
+        "deadline":       np.array([t.deadline for t in tasks], dtype=float),
+        "task_priority":  np.array([_opt(t.priority) for t in tasks], dtype=float),
+    }
+
+
+def write_npz(system: System, path, key):
+    """原子写出 (先写临时文件再 os.replace)，并发 case 不会读到半个文件。"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, inputs_digest=np.array(key), **system_arrays(system))
+    os.replace(tmp, path)
+
+
+def _nullable(values, cast):
+    return [None if v != v else cast(v) for v in values]   # NaN != NaN
+
+
+_NPY_HEADERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def _mmap_npz(path) -> dict:
+    """npz → {列名: 只读 np.memmap}。np.load 对 npz 会忽略 mmap_mode、把成员整个读进内存；
+    np.savez 写出的成员不压缩 (ZIP_STORED)，数据在文件里连续存放，直接按偏移映射即可。"""
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: 成员 {info.filename} 是压缩的，无法映射")
+            f.seek(info.header_offset)
+            local = f.read(30)                       # 本地文件头：文件名 / 扩展字段长度在 26、28 字节处
+            name_len, extra_len = struct.unpack("<HH", local[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            read_header = _NPY_HEADERS.get(np.lib.format.read_magic(f))
+            if read_header is None:
+                raise ValueError(f"{path}: 成员 {info.filename} 的 .npy 版本不支持映射")
+            shape, fortran, dtype = read_header(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}: 成员 {info.filename} 是 object 数组，无法映射")
+            key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[key] = np.empty(shape, dtype)
+            else:
+                arrays[key] = np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                        order="F" if fortran else "C", offset=f.tell())
+    return arrays
+
+
+class LazyTasks(Sequence):
+    """一个组件的任务：npz 里连续的一段行 [lo, hi)。长度直接由行号得出；
+    第一次按元素访问时才从映射的列上一次性生成 Task 对象，之后复用同一个列表。"""
+
+    def __init__(self, cols: dict, lo: int, hi: int, component_id: str, core_id):
+        self._cols, self._lo, self._hi = cols, lo, hi
+        self._comp, self._core = component_id, core_id
+        self._tasks = None
+
+    def _build(self):
+        if self._tasks is None:
+            rows = slice(self._lo, self._hi)
+            c = self._cols
+            self._tasks = [Task(name=name, component_id=self._comp, core_id=self._core,
+                                wcet=wcet, period=period, priority=prio, deadline=deadline)
+                           for name, wcet, period, deadline, prio in zip(
+                               c["task_name"][rows].tolist(), c["wcet"][rows].tolist(),
+                               c["period"][rows].tolist(), c["deadline"][rows].tolist(),
+                               _nullable(c["task_priority"][rows].tolist(), int))]
+            self._cols = None                         # 生成后不再引用映射
+        return self._tasks
+
+    def __len__(self):
+        return self._hi - self._lo if self._tasks is None else len(self._tasks)
+
+    def __getitem__(self, i):
+        return self._build()[i]
+
+    def __iter__(self):
+        return iter(self._build())
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (list, Sequence)) else NotImplemented
+
+    def __repr__(self):
+        return repr(self._build())
+
+    def __reduce__(self):
+        return list, (self._build(),)   # pickle / deepcopy 时变成普通列表，不把整张映射列带过去
+
+
+def read_npz(path, key=None):
+    """npz → System；文件不存在或输入哈希对不上时返回 None。
+    列以只读内存映射打开，不拷贝；核心 / 组件对象当场生成 (数量少)，
+    各组件的 Task 对象由 LazyTasks 在第一次访问时才生成。"""
+    try:
+        z = _mmap_npz(path)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+    if key is not None and str(z.get("inputs_digest", "")) != key:
+        return None
+    core_ids = z["core_id"].tolist()
+    cores = {cid: Core(cid, sf, sched) for cid, sf, sched in
+             zip(core_ids, z["speed_factor"].tolist(), z["core_scheduler"].tolist())}
+    comp_core = [core_ids[i] if i >= 0 else None for i in z["comp_core"].tolist()]
+    # system_arrays 按组件顺序写出任务，task_comp 单调不减：每个组件占连续的一段行
+    bounds = np.searchsorted(z["task_comp"], np.arange(len(comp_core) + 1)).tolist()
+    components = {}
+    for i, (cid, sched, core, prio, a_bud, d_bud) in enumerate(zip(
+            z["comp_id"].tolist(), z["comp_scheduler"].tolist(), comp_core,
+            _nullable(z["comp_priority"].tolist(), int),
+            _nullable(z["alpha_budget"].tolist(), float), _nullable(z["delta_budget"].tolist(), float))):
+        components[cid] = Component(component_id=cid, scheduler=sched, core_id=core, priority=prio,
+                                    alpha_budget=a_bud, delta_budget=d_bud,
+                                    tasks=LazyTasks(z, bounds[i], bounds[i + 1], cid, core))
+    return System(cores=cores, components=components)
+
+
+def load_system(paths: config.CasePaths, use_cache=True) -> System:
+    """优先从 preprocessed.npz 还原 System；缺失 / 过期 / use_cache=False 时重新解析 CSV 并刷新 npz。"""
+    key = inputs_digest(paths)
+    if use_cache:
+        with metrics.timer("preprocess.read_npz"):
+            system = read_npz(paths.preprocessed_npz_path, key)
+        if system is not None:
+            print(f"♻️ 从 {paths.preprocessed_npz_path} 载入预处理结果：components={len(system.components)}, "
+                  f"tasks={sum(len(c.tasks) for c in system.components.values())}")
+            return system
+    system = build_system(paths)
+    with metrics.timer("preprocess.write_npz"):
+        write_npz(system, paths.preprocessed_npz_path, key)
+    return system
+
+
+def preprocess(paths: config.CasePaths) -> System:
+    system = build_system(paths)
+    write_npz(system, paths.preprocessed_npz_path, inputs_digest(paths))
+    write_preprocessed(system, paths.preprocessed_tasks_path)
+    return system
+
+
+def main():
+    preprocess(config.current_paths())
 
 
 if __name__ == "__main__":
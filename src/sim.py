@@ -1,11 +1,12 @@
-import pandas as pd
-import math, os
+import math
 import config
+from model import Interface, SupplyTask, System, records_from_csv, records_to_csv
 
 """sim.py  —  Half‑Half 转换 (verbose)
 --------------------------------------------------
-读取 analyzer 的 α,Δ 结果 → 生成 resource_supply.csv (Q,P)
+analyzer 的 Interface (α,Δ) → SupplyTask (Q,P)，可选写出 resource_supply.csv
 注意：此文件只负责转换，不做仿真。
+Q,P 在内存中保持全精度，不再四舍五入到 2 位小数。
 """
 
 # --------------------------------------------------
@@ -22,38 +23,34 @@ def half_half_to_qp(alpha: float, delta: float):
     if delta == 0:
         P = 100.0  # 可根据需要改为其他常数或最大 period
         Q = alpha * P
-        return round(Q, 2), round(P, 2)
+        return Q, P
     P = delta / (1.0 - alpha)
     Q = alpha * P
-    return round(Q, 2), round(P, 2)
+    return Q, P
 
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
 
-def main():
-    analysis_path = config.ANALYSIS_RESULT_PATH
-    out_path = config.RESOURCE_SUPPLY_PATH
-
-    df = pd.read_csv(analysis_path)
-    print(f"=== Half‑Half 转换：读取 {analysis_path} 共 {len(df)} 行 ===")
-    task_df = pd.read_csv(config.PREPROCESSED_TASKS_PATH) #加载任务表
-
-    rows = []
-    for idx, row in df.iterrows():
-        comp_id = row["component_id"]
-        alpha = row["alpha"]
-        delta = row["delta"]
+def convert_system(system: System, interfaces):
+    """逐组件把 (α,Δ) 转为供给任务，返回 [SupplyTask, ...]。"""
+    print(f"=== Half‑Half 转换：{len(interfaces)} 个组件接口 ===")
+
+    supplies = []
+    for r in interfaces:
+        comp_id = r.component_id
+        alpha = r.alpha
+        delta = r.delta
         #计算当前组件负载：报告中展示任务总负载与α的对比，判断α是否过度保守或紧张，可辅助判断 α 合理性
-        df_tasks = task_df[task_df["component_id"] == comp_id]
-        load = sum(df_tasks["wcet"] / df_tasks["period"])
+        comp_tasks = system.components[comp_id].tasks
+        load = sum(t.wcet / t.period for t in comp_tasks)
         load = round(load, 3)
 
-        schedulable = bool(row["schedulable"])
-        scheduler = row["scheduler"].strip().upper()
-        core_id = row["core_id"]
+        schedulable = bool(r.schedulable)
+        scheduler = r.scheduler.strip().upper()
+        core_id = r.core_id
 
-        if not schedulable or pd.isna(alpha) or pd.isna(delta):
+        if not schedulable or alpha is None or delta is None or math.isnan(alpha) or math.isnan(delta):
             print(f"[SKIP] {comp_id} 不可调度或缺少 αΔ")
             continue
         if alpha >= 1.0:
@@ -61,25 +58,42 @@ def main():
             continue
         try:
             Q, P = half_half_to_qp(alpha, delta)
-            rows.append({
-                "component_id": comp_id,
-                "core_id": core_id,
-                "scheduler": scheduler,
-                "Q": Q,
-                "P": P,
-                "load": load
-            })
-            print(f"[OK] {comp_id:<15} α={alpha:<4} Δ={delta:<3} ⇒ Q={Q:<6} P={P:<6}  load={load}")
+            supplies.append(SupplyTask(
+                component_id=comp_id,
+                core_id=core_id,
+                scheduler=scheduler,
+                Q=Q,
+                P=P,
+                load=load,
+            ))
+            print(f"[OK] {comp_id:<15} α={alpha:<4} Δ={delta:<3} ⇒ Q={Q:<6.2f} P={P:<6.2f}  load={load}")
         except ValueError as e:
             print(f"[ERR] {comp_id}: {e}")
 
-    if not rows:
+    if not supplies:
         print("✗ 未生成任何供给任务！")
+    return supplies
+
+
+def write_supplies(supplies, path):
+    if not supplies:
         return
+    records_to_csv(supplies, path)
+    print(f"\n✅ resource_supply.csv 写入 {path} (rows={len(supplies)})")
 
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    pd.DataFrame(rows).to_csv(out_path, index=False)
-    print(f"\n✅ resource_supply.csv 写入 {out_path} (rows={len(rows)})")
+
+def convert(paths: config.CasePaths):
+    """analysis_result.csv → resource_supply.csv，返回生成的供给任务。"""
+    import preprocess_data
+    system = preprocess_data.load_system(paths)
+    interfaces = records_from_csv(Interface, paths.analysis_result_path)
+    supplies = convert_system(system, interfaces)
+    write_supplies(supplies, paths.resource_supply_path)
+    return supplies
+
+
+def main():
+    convert(config.current_paths())
 
 if __name__ == "__main__":
     main()
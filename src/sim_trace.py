@@ -0,0 +1,147 @@
+import json, os, shutil, struct
+import numpy as np
+
+"""sim_trace.py — 仿真执行轨迹 (流式写出 / 按需读取)
+--------------------------------------------------
+仿真器逐事件调用 TraceWriter.emit，事件先攒在小缓冲区里，
+满 CHUNK_EVENTS 条就编码成一个定长记录块追加到文件，内存占用与仿真时长无关。
+
+文件布局 (trace.bin)：
+    MAGIC
+    块 × N:  块头 <core u16, n u32, t_first f8, t_last f8>  +  n 条 RECORD_DTYPE 记录
+名称表 (核心 / 组件 / 任务 / 事件类型) 写在同名 .json 里。
+块内按时间有序且带 [t_first, t_last]，TraceReader 按时间窗 / 核心筛选时
+不相关的块直接 seek 跳过，不需要把整个文件读进内存。
+"""
+
+MAGIC = b"DRTSTRC1"
+CHUNK_EVENTS = 65536
+
+# 事件类型
+RELEASE, START, PREEMPT, DEPLETE, COMPLETE, MISS = range(6)
+KIND_NAMES = ["release", "start", "preempt", "deplete", "complete", "miss"]
+
+CHUNK_HEADER = struct.Struct("<HIdd")
+RECORD_DTYPE = np.dtype([("t", "<f8"), ("kind", "u1"), ("comp", "<u2"),
+                         ("task", "<u2"), ("value", "<f8")])   # value: complete/miss 时为响应时间
+
+
+def meta_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+class TraceWriter:
+    """components: [(component_id, [task_name, ...]), ...]，
+    emit 中的 comp / task 即这里的下标。"""
+
+    def __init__(self, path, cores, components, write_meta=True):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.cores = list(cores)
+        self.components = [(cid, list(names)) for cid, names in components]
+        self.comp_index = {cid: i for i, (cid, _) in enumerate(self.components)}
+        self.write_meta = write_meta   # 并行仿真的分片不写名称表
+        self.core = 0
+        self.buf = []
+        self.n_events = 0
+        self.f = open(path, "wb")
+        self.f.write(MAGIC)
+
+    def set_core(self, core_id):
+        self.flush()
+        self.core = self.cores.index(core_id)
+
+    def emit(self, t, kind, comp, task=0, value=0.0):
+        self.buf.append((t, kind, comp, task, value))
+        if len(self.buf) >= CHUNK_EVENTS:
+            self.flush()
+
+    def flush(self):
+        if not self.buf:
+            return
+        rec = np.array(self.buf, dtype=RECORD_DTYPE)
+        self.f.write(CHUNK_HEADER.pack(self.core, len(rec), rec["t"][0], rec["t"][-1]))
+        self.f.write(rec.tobytes())
+        self.n_events += len(rec)
+        self.buf = []
+
+    def merge_part(self, part_path, n_events):
+        """把另一个 TraceWriter 写出的分片 (同样的核心 / 组件表) 整块拼接进来并删除分片。"""
+        self.flush()
+        with open(part_path, "rb") as part:
+            if part.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{part_path} 不是 trace 文件")
+            shutil.copyfileobj(part, self.f)
+        os.remove(part_path)
+        self.n_events += n_events
+
+    def close(self):
+        self.flush()
+        self.f.close()
+        if not self.write_meta:
+            return
+        meta = {"cores": self.cores,
+                "components": [cid for cid, _ in self.components],
+                "tasks": [names for _, names in self.components],
+                "kinds": KIND_NAMES,
+                "n_events": self.n_events}
+        with open(meta_path(self.path), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    def __init__(self, path):
+        self.path = path
+        with open(meta_path(path), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+    def chunks(self, t0=None, t1=None, core=None):
+        """逐块产出 (core_id, 记录数组)；时间窗 / 核心不相交的块只读块头就跳过。"""
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} 不是 trace 文件")
+            while True:
+                head = f.read(CHUNK_HEADER.size)
+                if len(head) < CHUNK_HEADER.size:
+                    return
+                ci, n, first, last = CHUNK_HEADER.unpack(head)
+                size = n * RECORD_DTYPE.itemsize
+                core_id = self.meta["cores"][ci]
+                if ((core is not None and core_id != core)
+                        or (t0 is not None and last < t0) or (t1 is not None and first > t1)):
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                yield core_id, np.frombuffer(f.read(size), dtype=RECORD_DTYPE)
+
+    def read(self, t0=None, t1=None, component=None, core=None):
+        """按时间窗 [t0, t1] / 组件 / 核心筛选，返回名称已解码的 DataFrame。"""
+        import pandas as pd
+        comp_idx = None if component is None else self.meta["components"].index(component)
+        parts = []
+        for core_id, rec in self.chunks(t0, t1, core):
+            mask = np.ones(len(rec), dtype=bool)
+            if t0 is not None:
+                mask &= rec["t"] >= t0
+            if t1 is not None:
+                mask &= rec["t"] <= t1
+            if comp_idx is not None:
+                mask &= rec["comp"] == comp_idx
+            rec = rec[mask]
+            if len(rec):
+                parts.append(pd.DataFrame(rec).assign(core_id=core_id))
+        cols = ["core_id", "t", "event", "component_id", "task_name", "value"]
+        if not parts:
+            return pd.DataFrame(columns=cols)
+        df = pd.concat(parts, ignore_index=True)
+        comps, tasks = self.meta["components"], self.meta["tasks"]
+        df["event"] = [KIND_NAMES[k] for k in df["kind"]]
+        df["component_id"] = [comps[c] for c in df["comp"]]
+        df["task_name"] = [tasks[c][t] if k != DEPLETE else "" for c, t, k in
+                           zip(df["comp"], df["task"], df["kind"])]
+        return df[cols]
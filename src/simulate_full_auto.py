@@ -1,136 +1,544 @@
-import pandas as pd, os, math
+import argparse, math, heapq, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import config
+import metrics
+import sim_trace
+import timebase
+from model import SupplyTask, System, records_from_csv, records_to_csv
+
+"""simulate_full_auto.py — 两级分层仿真 (事件驱动版)
+时间不再按 QUANTUM 逐 tick 前进，而是直接在下列事件之间跳转：
+    • 任务释放            (k · period；上一个 job 仍未完成则记 miss，响应时间按删失值 ≥ D 计入)
+    • 组件预算补充        (k · P，预算重置为 Q，未用完的部分作废)
+    • 任务完成 / 预算耗尽 (当前运行段的结束点)
+释放 / 补充时刻由 ReleaseCalendar 的数组给出（k · period，非整数周期同样精确），
+同一时刻到期的一批事件一次性用 NumPy 推进。
+每个核心的组件互不影响，因此逐核心独立推进事件队列；
+workers > 1 时各核心分到进程池中并行仿真，最后按核心合并结果。
+运行时间 ∝ 调度事件数，而不是 仿真时长 × 任务数。
+
+仿真时长按核心自适应：
+    H = 该核上全部任务周期与供给周期 P 的最小公倍数（timebase 按有理数精确求 LCM）
+在每个 k·H 边界记录系统状态（各组件剩余预算、各任务剩余执行量），
+若与上一个边界完全相同，之后的调度只会逐个超周期重复，提前结束；
+否则最多仿真 MAX_HYPERPERIODS 个超周期，且不超过 MAX_SIM_TIME。
+实际使用的超周期 / 仿真时长写入 solution.csv 的 hyperperiod / sim_horizon / steady_state 列。
+给定 trace_path 时，release / start / preempt / deplete / complete / miss 事件
+经 sim_trace.TraceWriter 流式写出，可用 sim_trace.TraceReader 按时间窗 / 组件读取。
+"""
+
+MAX_HYPERPERIODS = 10        # 未进入稳态时最多仿真的超周期个数
+MAX_SIM_TIME     = 200_000   # 单核仿真时长上限 (TU)
+EPS              = 1e-6      # 浮点容差
+RT_HIST_WIDTH    = None      # 响应时间直方图桶宽 (TU)；None = 不统计直方图
+# 仿真语义版本：参与仿真缓存键 (pipeline.case_key)。仿真器行为 (调度 / 预算 / miss 统计) 每改一次 +1，
+# 旧的缓存结果随之失效。2 = 预算补充时重置为 Q、时限末尾只计已到截止期的 job、被覆盖的未完成 job 记 miss；
+# 3 = 大 scale 时间基下释放日历不再因 int64 回绕而乱序
+SIM_SEMANTICS_VERSION = 3
+INT64_SAFE       = 2**62     # 整数 tick 乘积超过它就改用 Python 整数，避免 int64 回绕
 
-"""simulate_full_auto.py — 两级分层仿真 (Deadline‑miss fix + verbose)"""
 
-QUANTUM   = 1.0    # 执行粒度 (TU)
-SIM_TIME  = 5000   # 仿真总时长 (TU)
-EPS       = 1e-6   # 浮点容差
 
 # --------------------------------------------------
-# 读取输入
+# 运行时状态：__slots__ 对象，按属性访问，不走 dict 哈希
+# 响应时间只保留 count / sum / max（及可选直方图），内存不随仿真时长增长
 # --------------------------------------------------
-tasks_df  = pd.read_csv(config.TASKS_PATH)
-arch_df   = pd.read_csv(config.ARCH_PATH)
-supply_df = pd.read_csv(config.RESOURCE_SUPPLY_PATH)
-print(f"=== Simulator: tasks={len(tasks_df)}, cores={len(arch_df)}, supplies={len(supply_df)} ===")
+class TaskState:
+    __slots__ = ("name", "period", "wcet", "priority", "prio_key", "offset", "exec_time",
+                 "release", "deadline", "remaining", "job", "miss_cnt",
+                 "rt_count", "rt_sum", "rt_max", "rt_hist", "hist_width")
+
+    def __init__(self, task, hist_width=RT_HIST_WIDTH):
+        self.name      = task.name
+        self.period    = task.period
+        self.wcet      = task.wcet              # 预处理时已按 speed_factor 折算
+        self.priority  = task.priority
+        self.prio_key  = task.priority if task.priority is not None else 1e9
+        self.offset    = 0.0                    # 首次释放相位：第 k 个 job 在 offset + k·period 释放
+        self.exec_time = None                   # None = 每个 job 执行 wcet；否则为每次释放调用的采样函数
+        # Job runtime state
+        self.release   = None
+        self.deadline  = None
+        self.remaining = 0.0
+        self.job       = 0
+        self.miss_cnt  = 0
+        self.rt_count  = 0
+        self.rt_sum    = 0.0
+        self.rt_max    = 0.0
+        self.hist_width = hist_width
+        self.rt_hist   = {} if hist_width else None
 
-# 核心信息
-a_core = {row.core_id: {"speed": row.speed_factor,
-                        "scheduler": row.scheduler.strip().upper()} for _, row in arch_df.iterrows()}
+    def record(self, rt):
+        self.rt_count += 1
+        self.rt_sum   += rt
+        if rt > self.rt_max:
+            self.rt_max = rt
+        if self.rt_hist is not None:
+            b = int(rt // self.hist_width)
+            self.rt_hist[b] = self.rt_hist.get(b, 0) + 1
+
+
+class ServerState:
+    __slots__ = ("component_id", "core_id", "scheduler", "Q", "P", "budget", "priority", "tasks")
+
+    def __init__(self, comp, supply, hist_width=RT_HIST_WIDTH):
+        self.component_id = comp.component_id
+        self.core_id   = supply.core_id
+        self.scheduler = supply.scheduler.upper()   # 内部
+        self.Q         = supply.Q
+        self.P         = supply.P
+        self.budget    = 0.0
+        self.priority  = None                       # 供给任务不带顶层优先级，顶层 RM 按组件顺序
+        self.tasks     = [TaskState(task, hist_width) for task in comp.tasks]
 
-# BDR → 供给
-a_supply = supply_df.set_index("component_id").to_dict("index")
 
 # --------------------------------------------------
-# 构建组件结构
+# 内存模型 → 组件 / 核心运行时结构
 # --------------------------------------------------
-components = {}
-for _, row in tasks_df.iterrows():
-    cid = row.component_id
-    if cid not in a_supply:
-        print(f"[WARN] {row.task_name} 的 component {cid} 无供给条目，跳过")
-        continue
-    if cid not in components:
-        info = a_supply[cid]
-        components[cid] = {
-            "core_id"   : info["core_id"],
-            "scheduler" : info["scheduler"].upper(),   # 内部
-            "Q"         : info["Q"],
-            "P"         : info["P"],
-            "budget"    : 0.0,
-            "priority"  : info.get("priority"),         # 顶层 RM 用
-            "tasks"     : []
-        }
-    speed = a_core[components[cid]["core_id"]]["speed"]
-    components[cid]["tasks"].append({
-        "name"      : row.task_name,
-        "period"    : row.period,
-        "wcet"      : row.wcet / speed,   # 再保险
-        "priority"  : row.priority,
-        # Job runtime state
-        "release"   : None,
-        "deadline"  : None,
-        "remaining" : 0.0,
-        "miss_cnt"  : 0,
-        "rts"       : []
-    })
-
-# 将组件挂到核
-cores = {}
-for cid, comp in components.items():
-    core_id = comp["core_id"]
-    cores.setdefault(core_id, {"scheduler": a_core[core_id]["scheduler"], "components": {}})["components"][cid] = comp
+def build_components(system: System, supplies, hist_width=RT_HIST_WIDTH, verbose=True):
+    if verbose:
+        print(f"=== Simulator: tasks={len(system.tasks)}, cores={len(system.cores)}, supplies={len(supplies)} ===")
+
+    # BDR → 供给
+    a_supply = {s.component_id: s for s in supplies}
+
+    components = {}
+    for comp in system.components.values():
+        cid = comp.component_id
+        if cid not in a_supply:
+            for task in comp.tasks if verbose else ():
+                print(f"[WARN] {task.name} 的 component {cid} 无供给条目，跳过")
+            continue
+        components[cid] = ServerState(comp, a_supply[cid], hist_width)
+
+    # 将组件挂到核
+    cores = {}
+    for cid, comp in components.items():
+        core_id = comp.core_id
+        cores.setdefault(core_id, {"scheduler": system.cores[core_id].scheduler, "components": {}})["components"][cid] = comp
+    return components, cores
+
+
+# --------------------------------------------------
+# 两级调度决策：就绪堆
+# --------------------------------------------------
+def _comp_priority(c):
+    p = c.priority
+    if p is None or (isinstance(p, float) and math.isnan(p)):
+        return 1e9
+    return p
+
+
+class ReadyQueue:
+    """带惰性删除的二叉堆，元素为 (key, idx, stamp)。
+    失效条目不主动删除，只在 peek 时由 is_valid(idx, stamp) 判定后丢弃，
+    因此 push / peek 均摊 O(log n)。key 相同时按 idx（即原始插入顺序）决胜。
+    """
+    __slots__ = ("heap", "is_valid")
+
+    def __init__(self, is_valid):
+        self.heap = []
+        self.is_valid = is_valid
+
+    def push(self, key, idx, stamp):
+        heapq.heappush(self.heap, (key, idx, stamp))
+
+    def peek(self):
+        heap = self.heap
+        while heap and not self.is_valid(heap[0][1], heap[0][2]):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+def _pending_job(tasks):
+    """任务堆条目有效 ⇔ 仍是同一个 job 且尚有剩余执行量。"""
+    return lambda ti, job: tasks[ti].job == job and tasks[ti].remaining > EPS
+
+
+class CoreScheduler:
+    """单核两级就绪结构，在 释放 / 完成 / 预算变化 时增量更新。
+    • 组件内：按 RM priority 或绝对 deadline 排序的任务堆
+    • 核心层：按组件 priority (RM) 或组件内最早 deadline (EDF) 排序的组件堆
+    """
+
+    def __init__(self, core, comps):
+        self.comps = comps
+        self.core_edf = core["scheduler"] != "RM"
+        self.comp_prio = [_comp_priority(c) for c in comps]
+        self.comp_ver = [0] * len(comps)
+        self.core_q = ReadyQueue(lambda ci, ver: self.comp_ver[ci] == ver)
+        self.task_q, self.dl_q = [], []
+        for comp in comps:
+            valid = _pending_job(comp.tasks)
+            tq = ReadyQueue(valid)
+            self.task_q.append(tq)
+            # 顶层 EDF 需要组件内最早 deadline；组件内本身是 EDF 时两者共用同一个堆
+            self.dl_q.append(tq if comp.scheduler != "RM" else ReadyQueue(valid))
+
+    def release(self, ci, ti):
+        """新 job 入堆；调用方随后需 refresh(ci)。"""
+        comp = self.comps[ci]
+        tsk = comp.tasks[ti]
+        tsk.job += 1
+        if comp.scheduler == "RM":
+            self.task_q[ci].push(tsk.prio_key, ti, tsk.job)
+            if self.core_edf:
+                self.dl_q[ci].push(tsk.deadline, ti, tsk.job)
+        else:
+            self.task_q[ci].push(tsk.deadline, ti, tsk.job)
+
+    def refresh(self, ci):
+        """组件就绪状态或排序键可能变化：旧条目作废，若仍就绪则重新入堆。"""
+        self.comp_ver[ci] += 1
+        comp = self.comps[ci]
+        if comp.budget <= EPS or self.task_q[ci].peek() is None:
+            return
+        if self.core_edf:
+            key = self.dl_q[ci].peek()[0]
+        else:
+            key = self.comp_prio[ci]
+        self.core_q.push(key, ci, self.comp_ver[ci])
+
+    def pick(self):
+        """返回 (组件下标, 组件, 任务)；若本核当前无可执行任务返回 (None, None, None)。"""
+        top = self.core_q.peek()
+        if top is None:
+            return None, None, None
+        ci = top[1]
+        comp = self.comps[ci]
+        return ci, comp, comp.tasks[self.task_q[ci].peek()[1]]
+
+
+# --------------------------------------------------
+# 释放日历：每个周期源 (供给 / 任务) 的下一次到期时刻
+# --------------------------------------------------
+class ReleaseCalendar:
+    """按窗口预先算好的释放 / 补充日历。
+    周期以 timebase 的整数 tick 给出 (1 TU = scale ticks)。
+    窗口长度取超周期 H 时，每个窗口内的到期模式完全相同：
+    排序只在构造时用 NumPy 做一次 (lexsort)，第 k 个窗口的时刻
+        offset[src] + (k · n[src] + j) · period[src] / scale
+    整批向量化算出：整数 tick 相乘后只做一次除法，
+    有理数周期 (如 500/63) 的倍数与整数时刻重合时得到完全相同的浮点值，
+    同一时刻 “先补预算、再释放任务” 的顺序不会因 1 ulp 的误差被打乱。
+    内存只占一个窗口，与总仿真时长无关。"""
+    __slots__ = ("period", "scale", "offset", "n", "src", "j")
+
+    def __init__(self, period_ticks, counts, offsets=None, window_len=None, scale=1):
+        big = max(map(abs, period_ticks), default=0) >= INT64_SAFE
+        self.period = np.asarray(period_ticks, dtype=object if big else np.int64)
+        self.scale = scale
+        self.offset = np.zeros(len(self.period)) if offsets is None else np.asarray(offsets, dtype=float)
+        self.n = np.asarray(counts, dtype=np.int64)       # 每个源在一个窗口内的到期次数
+        src = np.repeat(np.arange(len(self.n)), self.n)
+        j = np.arange(len(src)) - np.repeat(np.cumsum(self.n) - self.n, self.n)
+        t0 = self.offset[src] + self._times(j, src)
+        if window_len is not None:
+            # 带相位时 offset + j·period 可能越过窗口末端：记为上一轮的第 j-n 次，
+            # 保证第 k 个窗口恰好覆盖 [k·H, (k+1)·H)，窗口之间不会乱序
+            wrap = t0 >= window_len
+            j = np.where(wrap, j - self.n[src], j)
+            t0 = self.offset[src] + self._times(j, src)
+        # 同一时刻按源下标排序：供给源在前 ⇒ 先补预算、再释放任务
+        # t0 由精确整数 tick 单调舍入得到，排序不会因 int64 回绕而错乱
+        order = np.lexsort((src, t0))
+        self.src, self.j = src[order], j[order]
+
+    def _times(self, m, src):
+        """第 m 次到期的时刻 m · period[src] / scale。
+        m · period 可能超出 int64 时改用 Python 整数 (object 数组) 精确相乘，不会静默回绕；
+        整数相除只舍入一次，保持时刻的先后顺序。"""
+        period = self.period[src]
+        if len(m) and max(abs(int(m.min())), abs(int(m.max()))) * int(np.abs(period).max()) >= INT64_SAFE:
+            return (m.astype(object) * period.astype(object) / self.scale).astype(float)
+        return m * period / self.scale
+
+    def window(self, k):
+        """第 k 个窗口的 [(到期时刻, 源下标), ...]，按时刻升序。"""
+        src, j = self.src, self.j
+        # 回绕条目 (j < 0) 在第 k 个窗口里是第 k·n + j 次到期；k = 0 时次数为负，
+        # 时刻落在 [0, offset) 内、早于该源的首次到期 offset，实际并不存在
+        if k == 0:
+            keep = j >= 0
+            src, j = src[keep], j[keep]
+        times = self.offset[src] + self._times(k * self.n[src] + j, src)
+        return list(zip(times.tolist(), src.tolist()))
+
 
 # --------------------------------------------------
-# 仿真循环
+# 超周期与仿真时长
 # --------------------------------------------------
-print("\n--- 仿真开始 ---")
-for t in range(SIM_TIME):
-    # 1) 供给补充 & 任务释放
-    for comp in components.values():
-        if t % comp["P"] == 0:
-            comp["budget"] += comp["Q"]
-        for task in comp["tasks"]:
-            if t % task["period"] == 0:
-                task["release"]   = t
-                task["deadline"]  = t + task["period"]
-                task["remaining"] = task["wcet"]
-    # 2) 每核调度组件
-    for core in cores.values():
-        ready_comps = [c for c in core["components"].values() if c["budget"]>EPS and any(tsk["remaining"]>EPS for tsk in c["tasks"])]
-        if not ready_comps:
+def core_hyperperiod(core):
+    periods = []
+    for comp in core["components"].values():
+        periods.append(comp.P)
+        periods.extend(tsk.period for tsk in comp.tasks)
+    return timebase.hyperperiod(periods)
+
+
+def _core_state(comps):
+    """超周期边界上的系统状态：各组件剩余预算 + 各任务剩余执行量。"""
+    return tuple((round(c.budget, 6),) + tuple(round(t.remaining, 6) for t in c.tasks)
+                 for c in comps)
+
+
+# --------------------------------------------------
+# 单核事件驱动仿真
+# --------------------------------------------------
+def simulate_core(core, max_time=MAX_SIM_TIME, max_hyperperiods=MAX_HYPERPERIODS, trace=None,
+                  steady_check=True):
+    """仿真单核，返回 (超周期, 实际仿真时长, 是否检测到稳态, 处理的调度事件数)。
+    trace 为 sim_trace.TraceWriter 时逐事件写出执行轨迹；
+    执行时间随机时系统不再按超周期重复，应传 steady_check=False。"""
+    comps = list(core["components"].values())
+    sched = CoreScheduler(core, comps)
+    gid = [trace.comp_index[c.component_id] for c in comps] if trace else None
+    running = None   # 上一段执行的 (组件下标, 任务下标)，仅用于轨迹中的 start / preempt
+
+    hyper = core_hyperperiod(core)
+    n_hyper = min(max_hyperperiods, int(max_time // hyper))
+    sim_time = float(hyper * n_hyper) if n_hyper else float(max_time)
+    k_boundary, prev_state = 1, _core_state(comps)
+
+    # 日历源：先全部供给、后全部任务；窗口 = 一个超周期（超周期过大时一个窗口覆盖整个仿真）
+    sources = [(ci, -1) for ci in range(len(comps))]
+    sources += [(ci, ti) for ci, comp in enumerate(comps) for ti in range(len(comp.tasks))]
+    periods = [comp.P for comp in comps] + [comps[ci].tasks[ti].period for ci, ti in sources[len(comps):]]
+    tb = timebase.TimeBase.of(periods)
+    period_ticks = [tb.ticks(p) for p in periods]
+    if n_hyper:
+        counts = [tb.ticks(hyper) // pt for pt in period_ticks]
+    else:
+        counts = [math.ceil(sim_time / p) for p in periods]
+    offsets = [0.0] * len(comps) + [comps[ci].tasks[ti].offset for ci, ti in sources[len(comps):]]
+    calendar = ReleaseCalendar(period_ticks, counts, offsets, float(hyper) if n_hyper else None, tb.scale)
+    k_window, window, pos = 0, calendar.window(0), 0
+
+    t = 0.0
+    n_events = 0
+    while t < sim_time:
+        n_events += 1
+        # 0) 超周期边界：状态与上一边界相同 ⇒ 已进入稳态，之后只会重复
+        if steady_check and k_boundary < n_hyper and t >= float(hyper * k_boundary) - EPS:
+            state = _core_state(comps)
+            if state == prev_state:
+                return hyper, float(hyper * k_boundary), True, n_events
+            prev_state = state
+            k_boundary += 1
+
+        # 1) 处理所有已到期事件：供给补充 & 任务释放；每个受影响组件只 refresh 一次
+        touched = set()
+        while window[pos][0] <= t + EPS:
+            due, src = window[pos]
+            pos += 1
+            if pos == len(window):
+                k_window, pos = k_window + 1, 0
+                window = calendar.window(k_window)
+            ci, ti = sources[src]
+            comp = comps[ci]
+            touched.add(ci)
+            if ti < 0:
+                # 周期资源语义：未用完的预算在补充点作废，不跨周期累积
+                comp.budget = comp.Q
+            else:
+                task = comp.tasks[ti]
+                if task.remaining > EPS:
+                    # 上一个 job 到下一次释放 (即其截止期) 仍未完成：记一次 miss，
+                    # 响应时间按删失值 due − release (≥ D) 计入，随后新 job 覆盖旧 job
+                    rt = due - task.release
+                    task.record(rt)
+                    task.miss_cnt += 1
+                    if trace:
+                        trace.emit(due, sim_trace.MISS, gid[ci], ti, rt)
+                task.release   = due
+                task.deadline  = task.release + task.period
+                task.remaining = task.wcet if task.exec_time is None else task.exec_time()
+                sched.release(ci, ti)
+                if trace:
+                    trace.emit(due, sim_trace.RELEASE, gid[ci], ti)
+                    if running == (ci, ti):
+                        running = None
+        for ci in sorted(touched):
+            sched.refresh(ci)
+
+        next_event = min(window[pos][0], sim_time)
+
+        # 2) 选组件 / 任务；无事可做则直接跳到下一事件
+        ci, comp, task = sched.pick()
+        if task is None:
+            t = next_event
             continue
-        if core["scheduler"] == "RM":
-            ready_comps.sort(key=lambda c: c["priority"] if (c.get("priority") is not None and not (isinstance(c.get("priority"), float) and math.isnan(c.get("priority")))) else 1e9)
-        else:  # EDF
-            ready_comps.sort(key=lambda c: min(tsk["deadline"] for tsk in c["tasks"] if tsk["remaining"]>EPS))
-        comp = ready_comps[0]
-
-        # 3) 组件内部选任务
-        runnable = [tsk for tsk in comp["tasks"] if tsk["remaining"]>EPS]
-        if comp["scheduler"] == "RM":
-            runnable.sort(key=lambda tsk: tsk["priority"] if pd.notna(tsk["priority"]) else 1e9)
-        else:  # EDF
-            runnable.sort(key=lambda tsk: tsk["deadline"])
-        task = runnable[0]
-
-        # 4) 执行
-        exec_amt = min(task["remaining"], QUANTUM, comp["budget"])
-        task["remaining"] -= exec_amt
-        comp["budget"]   -= exec_amt
-
-        # 5) 任务完成检查
-        if task["remaining"] <= EPS:
-            finish_time = t + exec_amt
-            rt = finish_time - task["release"]
-            task["rts"].append(rt)
-            if finish_time > task["deadline"] + EPS:
-                task["miss_cnt"] += 1
-
-# 6) 仿真结束后：若仍有剩余执行量视为 miss
-for comp in components.values():
-    for task in comp["tasks"]:
-        if task["remaining"] > EPS:
-            task["miss_cnt"] += 1
-print("--- 仿真结束 ---\n")
+
+        if trace:
+            ti = sched.task_q[ci].peek()[1]
+            if running != (ci, ti):
+                if running is not None:
+                    trace.emit(t, sim_trace.PREEMPT, gid[running[0]], running[1])
+                trace.emit(t, sim_trace.START, gid[ci], ti)
+                running = (ci, ti)
+
+        # 3) 执行到 任务完成 / 预算耗尽 / 下一事件 三者中最早的时刻
+        end = min(t + task.remaining, t + comp.budget, next_event)
+        exec_amt = end - t
+        task.remaining -= exec_amt
+        comp.budget    -= exec_amt
+        t = end
+
+        # 4) 任务完成检查
+        if task.remaining <= EPS:
+            task.remaining = 0.0
+            rt = t - task.release
+            task.record(rt)
+            if t > task.deadline + EPS:
+                task.miss_cnt += 1
+                if trace:
+                    trace.emit(t, sim_trace.MISS, gid[ci], running[1], rt)
+            if trace:
+                trace.emit(t, sim_trace.COMPLETE, gid[ci], running[1], rt)
+                running = None
+            sched.refresh(ci)
+        elif comp.budget <= EPS:
+            if trace:
+                trace.emit(t, sim_trace.DEPLETE, gid[ci])
+                running = None
+            sched.refresh(ci)
+    return hyper, sim_time, False, n_events
+
+
+def run_core(core_id, core, max_time=MAX_SIM_TIME, trace=None,
+             max_hyperperiods=MAX_HYPERPERIODS, steady_check=True):
+    """仿真单核并做收尾统计，结果写回 core (含其组件的任务状态)。"""
+    if trace:
+        trace.set_core(core_id)
+    t0 = time.perf_counter()
+    hyper, horizon, steady, events = simulate_core(core, max_time, max_hyperperiods, trace, steady_check)
+    core.update(hyperperiod=float(hyper), sim_horizon=horizon, steady_state=steady,
+                events=events, sim_seconds=time.perf_counter() - t0)
+
+    # 仿真结束后：deadline 已到却仍有剩余执行量视为 miss
+    # (同步释放且在超周期边界结束时，所有未完成 job 的 deadline 都已到)
+    for comp in core["components"].values():
+        for ti, task in enumerate(comp.tasks):
+            if task.remaining > EPS and task.deadline <= horizon + EPS:
+                task.record(horizon - task.release)   # 与释放时的未完成 job 一样按删失值计入
+                task.miss_cnt += 1
+                if trace:
+                    trace.emit(horizon, sim_trace.MISS, trace.comp_index[comp.component_id], ti,
+                               horizon - task.release)
+    return core
+
+
+def _run_core_job(core_id, core, max_time, trace_spec):
+    """进程池任务：trace_spec = (分片路径, 核心列表, 组件名称表) 或 None。
+    各核心的轨迹先写到自己的分片，由主进程按核心顺序拼接。"""
+    if trace_spec is None:
+        return run_core(core_id, core, max_time), 0
+    part, core_ids, names = trace_spec
+    writer = sim_trace.TraceWriter(part, core_ids, names, write_meta=False)
+    with writer:
+        core = run_core(core_id, core, max_time, writer)
+    return core, writer.n_events
+
+
+def simulate(cores, max_time=MAX_SIM_TIME, trace=None, workers=1):
+    """返回仿真后的 cores；并行时其中的组件是子进程送回的新对象。"""
+    print(f"\n--- 仿真开始 (workers={workers}) ---")
+    if workers > 1 and len(cores) > 1:
+        ids = list(cores)
+        specs = [None] * len(ids)
+        if trace:
+            specs = [(f"{trace.path}.{i}.part", trace.cores, trace.components) for i in range(len(ids))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outs = list(pool.map(_run_core_job, ids, [cores[c] for c in ids],
+                                 [max_time] * len(ids), specs))
+        cores = {cid: core for cid, (core, _) in zip(ids, outs)}
+        if trace:
+            for spec, (_, n_events) in zip(specs, outs):
+                trace.merge_part(spec[0], n_events)
+    else:
+        for core_id, core in cores.items():
+            run_core(core_id, core, max_time, trace)
+
+    for core_id, core in cores.items():
+        print(f"[CORE] {core_id:<8} H={core['hyperperiod']:<10g} horizon={core['sim_horizon']:<10g} "
+              f"{'稳态提前结束' if core['steady_state'] else '未检测到稳态'}")
+        metrics.add("sim.events", core["events"])
+        metrics.record("cores", core_id, {
+            "events": core["events"], "seconds": core["sim_seconds"],
+            "events_per_s": core["events"] / core["sim_seconds"] if core["sim_seconds"] else None,
+            "horizon": core["sim_horizon"], "steady_state": core["steady_state"]})
+    print("--- 仿真结束 ---\n")
+    return cores
+
 
 # --------------------------------------------------
 # 结果汇总
 # --------------------------------------------------
-rows = []
-for cid, comp in components.items():
-    comp_schedulable = all(tsk["miss_cnt"]==0 for tsk in comp["tasks"])
-    for task in comp["tasks"]:
-        rows.append({
-            "task_name"           : task["name"],
-            "component_id"        : cid,
-            "task_schedulable"    : int(task["miss_cnt"]==0),
-            "avg_response_time"   : round(sum(task["rts"])/len(task["rts"]), 2) if task["rts"] else 0.0,
-            "max_response_time"   : max(task["rts"], default=0.0),
-            "component_schedulable": int(comp_schedulable)
-        })
-
-os.makedirs(os.path.dirname(config.SOLUTION_PATH), exist_ok=True)
-pd.DataFrame(rows).to_csv(config.SOLUTION_PATH, index=False)
-print(f"✅ 结果已写入 {config.SOLUTION_PATH} (rows={len(rows)})")
+def summarize(components, cores):
+    rows = []
+    for cid, comp in components.items():
+        core = cores[comp.core_id]
+        comp_schedulable = all(tsk.miss_cnt==0 for tsk in comp.tasks)
+        for task in comp.tasks:
+            row = {
+                "task_name"           : task.name,
+                "component_id"        : cid,
+                "task_schedulable"    : int(task.miss_cnt==0),
+                "avg_response_time"   : round(task.rt_sum/task.rt_count, 2) if task.rt_count else 0.0,
+                "max_response_time"   : task.rt_max,
+                "component_schedulable": int(comp_schedulable),
+                "hyperperiod"         : core["hyperperiod"],
+                "sim_horizon"         : core["sim_horizon"],
+                "steady_state"        : int(core["steady_state"]),
+            }
+            if task.rt_hist is not None:
+                # "桶下界:次数;..."，桶宽 RT_HIST_WIDTH
+                row["rt_histogram"] = ";".join(f"{b * RT_HIST_WIDTH:g}:{n}" for b, n in sorted(task.rt_hist.items()))
+            rows.append(row)
+    return rows
+
+
+def simulate_system(system: System, supplies, max_time=MAX_SIM_TIME, trace_path=None, workers=1):
+    """内存模型 + 供给任务 → solution 行 (list[dict])。
+    trace_path 非 None 时同时把执行轨迹流式写到该文件；workers 为并行仿真的核心进程数 (0=全部 CPU)。"""
+    workers = workers or os.cpu_count() or 1
+    components, cores = build_components(system, supplies)
+    if trace_path is None:
+        cores = simulate(cores, max_time, workers=workers)
+    else:
+        with sim_trace.TraceWriter(trace_path, cores,
+                                   [(cid, [t.name for t in c.tasks]) for cid, c in components.items()]) as trace:
+            cores = simulate(cores, max_time, trace, workers)
+        print(f"🧵 执行轨迹写入 {trace_path} (events={trace.n_events})")
+    # 并行时组件对象来自子进程，按原顺序重新取出
+    components = {cid: cores[comp.core_id]["components"][cid] for cid, comp in components.items()}
+    return summarize(components, cores)
+
+
+def write_solution(rows, path):
+    records_to_csv(rows, path)
+    print(f"✅ 结果已写入 {path} (rows={len(rows)})")
+
+
+def run(paths: config.CasePaths, max_time=MAX_SIM_TIME, trace=False, workers=1):
+    """由 paths 下的原始输入与 resource_supply.csv 完成仿真，写出 solution.csv 并返回结果行。"""
+    import preprocess_data
+    system = preprocess_data.load_system(paths)
+    supplies = records_from_csv(SupplyTask, paths.resource_supply_path)
+    rows = simulate_system(system, supplies, max_time, paths.trace_path if trace else None, workers)
+    write_solution(rows, paths.solution_path)
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="两级分层仿真")
+    ap.add_argument("--trace", action="store_true", help="同时写出执行轨迹 trace.bin")
+    ap.add_argument("--workers", type=int, default=config.SIM_WORKERS,
+                    help="并行仿真的核心进程数 (1=串行, 0=全部 CPU 核心)")
+    args = ap.parse_args(argv)
+    run(config.current_paths(), trace=args.trace, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
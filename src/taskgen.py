@@ -0,0 +1,119 @@
+import argparse, math, os
+import numpy as np
+import pandas as pd
+
+"""taskgen.py — 合成测试用例生成器
+--------------------------------------------------
+生成与 DRTS_Project-Test-Cases 相同格式的 tasks.csv / budgets.csv / architecture.csv，
+规模从几十到 100 000 个任务，用于基准测试 (benchmark.py)。
+    • 利用率：UUniFast (Bini & Buttazzo)，先把每核目标利用率分给各组件，再分给组件内任务
+    • 周期：对数均匀分布于 [PERIOD_MIN, PERIOD_MAX]，按 PERIOD_GRAN 取整 (Emberson 等的做法)，
+      避免超周期无限膨胀
+    • WCET：u · T · speed_factor，预处理按 speed_factor 折算后恰好得到目标利用率
+    • 组件调度器按 rm_ratio 随机取 RM / EDF；RM 任务按周期给出唯一优先级
+    • 组件预算 (budget, period)：period 取组件最小任务周期的一半，budget 按利用率 × BUDGET_MARGIN
+同一组参数 + seed 生成的用例完全相同。
+"""
+
+GEN_SEED      = 2025
+PERIOD_MIN    = 10
+PERIOD_MAX    = 1000
+PERIOD_GRAN   = 10
+CORE_UTIL     = 0.6            # 每核 (折算后) 目标总利用率
+BUDGET_MARGIN = 1.2
+SPEED_RANGE   = (0.5, 1.0)
+RM_RATIO      = 0.5
+
+
+def uunifast(rng, n, total):
+    """n 个和为 total、在单纯形上均匀分布的利用率。"""
+    if n == 1:
+        return np.array([total])
+    r = rng.random(n - 1) ** (1.0 / np.arange(n - 1, 0, -1))
+    sums = total * np.concatenate(([1.0], np.cumprod(r)))
+    return sums - np.concatenate((sums[1:], [0.0]))
+
+
+def log_uniform_periods(rng, n, lo=PERIOD_MIN, hi=PERIOD_MAX, gran=PERIOD_GRAN):
+    p = np.exp(rng.uniform(math.log(lo), math.log(hi + gran), n))
+    return np.maximum(gran, np.floor(p / gran) * gran)
+
+
+def generate(n_tasks, n_cores=1, comps_per_core=2, util=CORE_UTIL, seed=GEN_SEED, rm_ratio=RM_RATIO):
+    """返回 (tasks, budgets, architecture) 三个 DataFrame。"""
+    rng = np.random.default_rng(seed)
+    n_comps = n_cores * comps_per_core
+    if n_tasks < n_comps:
+        raise ValueError(f"任务数 {n_tasks} 少于组件数 {n_comps}")
+
+    speeds = np.round(rng.uniform(*SPEED_RANGE, n_cores), 2)
+    arch = pd.DataFrame({
+        "core_id": [f"Core_{i + 1}" for i in range(n_cores)],
+        "speed_factor": speeds,
+        "scheduler": "EDF",
+    })
+
+    # 每个组件至少 1 个任务，其余随机分配
+    per_comp = rng.multinomial(n_tasks - n_comps, np.full(n_comps, 1.0 / n_comps)) + 1
+    task_rows, budget_rows = [], []
+    task_no = 0
+    for ci in range(n_comps):
+        core = ci // comps_per_core
+        if ci % comps_per_core == 0:
+            comp_utils = uunifast(rng, comps_per_core, util)
+        u_comp = comp_utils[ci % comps_per_core]
+        cid = f"Component_{ci + 1}"
+        sched = "RM" if rng.random() < rm_ratio else "EDF"
+
+        n = int(per_comp[ci])
+        periods = log_uniform_periods(rng, n)
+        wcets = np.maximum(0.01, np.round(uunifast(rng, n, u_comp) * periods * speeds[core], 2))
+        prios = np.argsort(np.argsort(periods, kind="stable")) if sched == "RM" else [None] * n
+        for T, C, prio in zip(periods, wcets, prios):
+            task_rows.append({"task_name": f"Task_{task_no}", "wcet": C, "period": int(T),
+                              "component_id": cid, "priority": None if prio is None else int(prio)})
+            task_no += 1
+
+        b_period = max(1, int(periods.min() // 2))
+        budget_rows.append({"component_id": cid, "scheduler": sched,
+                            "budget": min(b_period, math.ceil(u_comp * BUDGET_MARGIN * b_period)),
+                            "period": b_period, "core_id": arch["core_id"][core], "priority": None})
+
+    tasks = pd.DataFrame(task_rows).astype({"priority": "Int64"})
+    budgets = pd.DataFrame(budget_rows)
+    return tasks, budgets, arch
+
+
+def write_case(case_dir, tasks, budgets, arch):
+    os.makedirs(case_dir, exist_ok=True)
+    tasks.to_csv(os.path.join(case_dir, "tasks.csv"), index=False)
+    budgets.to_csv(os.path.join(case_dir, "budgets.csv"), index=False)
+    arch.to_csv(os.path.join(case_dir, "architecture.csv"), index=False)
+
+
+def shape_for(n_tasks, tasks_per_comp=10, comps_per_core=4):
+    """按任务数推出 (核心数, 每核组件数)：每组件约 tasks_per_comp 个任务。"""
+    n_comps = max(1, n_tasks // tasks_per_comp)
+    comps_per_core = min(comps_per_core, n_comps)
+    return max(1, n_comps // comps_per_core), comps_per_core
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="生成合成 DRTS 测试用例")
+    ap.add_argument("--tasks", type=int, required=True)
+    ap.add_argument("--cores", type=int, default=None, help="默认按每组件约 10 个任务推算")
+    ap.add_argument("--components", type=int, default=4, help="每核组件数")
+    ap.add_argument("--util", type=float, default=CORE_UTIL, help="每核目标利用率")
+    ap.add_argument("--rm-ratio", type=float, default=RM_RATIO)
+    ap.add_argument("--seed", type=int, default=GEN_SEED)
+    ap.add_argument("--out", required=True, help="输出的 case 目录")
+    args = ap.parse_args(argv)
+
+    cores, comps = (args.cores, args.components) if args.cores else shape_for(args.tasks, comps_per_core=args.components)
+    tasks, budgets, arch = generate(args.tasks, cores, comps, args.util, args.seed, args.rm_ratio)
+    write_case(args.out, tasks, budgets, arch)
+    print(f"✅ 生成 {len(tasks)} tasks / {len(budgets)} components / {len(arch)} cores → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
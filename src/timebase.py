@@ -0,0 +1,59 @@
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+
+"""timebase.py — 统一的有理数 / 整数时间基
+--------------------------------------------------
+周期、按 speed_factor 折算后的 WCET、Half-Half 得到的供给 (Q, P) 往往不是整数
+(例如 P = Δ/(1−α) = 500/63)。这里统一把它们转成有理数 (Fraction)，
+再取全部分母的最小公倍数作为 scale，于是每个时间量都是 scale 分之一的整数倍：
+    ticks = x · scale   (精确整数)
+超周期、截止期测试点、释放日历都在这个整数域里计算，
+不会再因 int() 截断或浮点乘法产生 “差一个 ulp” 的错位，Python 整数也不会溢出。
+浮点输入先用 limit_denominator(TIME_DENOM_MAX) 还原成最接近的简单分数。
+"""
+
+TIME_DENOM_MAX = 10**6   # 浮点 → 有理数时的分母上限
+
+
+def as_fraction(x):
+    if isinstance(x, Fraction):
+        return x
+    return Fraction(x).limit_denominator(TIME_DENOM_MAX)
+
+
+def hyperperiod(periods):
+    """有理数周期的最小公倍数：lcm(a/b, c/d) = lcm(a, c) / gcd(b, d)。"""
+    num, den = 0, 0
+    for p in map(as_fraction, periods):
+        num = p.numerator if num == 0 else math.lcm(num, p.numerator)
+        den = math.gcd(den, p.denominator)
+    return Fraction(num, den or 1)
+
+
+@dataclass(frozen=True)
+class TimeBase:
+    """1 TU = scale ticks；scale 为所有参与时间量分母的最小公倍数。"""
+    scale: int = 1
+
+    @classmethod
+    def of(cls, values):
+        scale = 1
+        for x in values:
+            scale = math.lcm(scale, as_fraction(x).denominator)
+        return cls(scale)
+
+    def ticks(self, x):
+        """时间 → 整数 tick (x 须可被本时间基精确表示)。"""
+        t = as_fraction(x) * self.scale
+        if t.denominator != 1:
+            raise ValueError(f"{x} 不能用 scale={self.scale} 的时间基精确表示")
+        return t.numerator
+
+    def time(self, ticks):
+        """整数 tick → float 时间 (整数相除，只舍入一次)。"""
+        return ticks / self.scale
+
+    def ceil(self, ticks):
+        """tick → 不小于它的最小整数时间 (精确整数向上取整)。"""
+        return -(-ticks // self.scale)
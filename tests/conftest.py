@@ -0,0 +1,4 @@
+import os, sys
+
+# src/ 下的模块按扁平方式互相 import (import config …)，测试同样直接从 src/ 导入
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
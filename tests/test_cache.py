@@ -0,0 +1,35 @@
+import os
+import cache
+
+
+def test_result_cache_round_trip(tmp_path):
+    rc = cache.ResultCache(str(tmp_path), 1 << 20)
+    key = cache.digest("comp", "A", (1.0, 2.0))
+    value = (True, 0.5, 3, {"rows": [1, 2, 3]})
+    assert rc.get("comp", key) is None
+    rc.put("comp", key, value)
+    assert rc.get("comp", key) == value
+    assert (rc.hits, rc.misses) == (1, 1)
+    assert cache.ResultCache(str(tmp_path), 1 << 20).get("comp", key) == value   # 另一个实例 / 进程同样可读
+
+
+def test_digest_depends_on_every_part():
+    assert cache.digest("comp", "A", 1) == cache.digest("comp", "A", 1)
+    assert cache.digest("comp", "A", 1) != cache.digest("comp", "A", 2)
+    assert cache.digest("comp", "A", 1) != cache.digest("sim", "A", 1)
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    rc = cache.ResultCache(str(tmp_path), 1 << 20)
+    with open(os.path.join(tmp_path, "comp-bad.pkl"), "wb") as f:
+        f.write(b"not a pickle")
+    assert rc.get("comp", "bad") is None
+
+
+def test_eviction_keeps_total_size_bounded(tmp_path):
+    rc = cache.ResultCache(str(tmp_path), 3000)
+    for i in range(10):
+        rc.put("sim", str(i), b"x" * 1000)
+    sizes = [os.path.getsize(os.path.join(tmp_path, n)) for n in os.listdir(tmp_path)]
+    assert sum(sizes) <= 3000
+    assert rc.get("sim", "9") == b"x" * 1000                    # 最近写入的条目保留
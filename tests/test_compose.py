@@ -0,0 +1,61 @@
+import random
+import numpy as np
+import pytest
+import compose
+
+GRID_END = 20_000   # 稠密网格终点：随机用例里 U 与 α_p 至少相差 0.02，失败点都落在这之前
+
+
+def dense_bdr(supplies, parent_alpha, parent_delta):
+    """Σ α_i·max(0, t − Δ_i) ≤ α_p·max(0, t − Δ_p)，在半整数网格上逐点检查 (断点都是整数)。"""
+    t = np.arange(0, 2 * GRID_END + 1) / 2
+    demand = sum(Q / P * np.maximum(0.0, t - (P - Q)) for Q, P in supplies)
+    return bool(np.all(demand <= parent_alpha * np.maximum(0.0, t - parent_delta) + 1e-9))
+
+
+def dense_dbf(supplies, parent_alpha, parent_delta):
+    """供给任务 (Q, P, D = P) 的 dbf(t) ≤ α_p·max(0, t − Δ_p)，在整数网格上逐点检查。"""
+    t = np.arange(0, GRID_END + 1)
+    demand = sum(Q * (t // P) for Q, P in supplies)
+    return bool(np.all(demand <= parent_alpha * np.maximum(0, t - parent_delta) + 1e-9))
+
+
+def random_cores(rng, n_cores, parent_alpha):
+    """{core_id: [(Q, P), ...]}，整数 Q / P；跳过 Σ Q/P 与 α_p 过于接近的核心。"""
+    cores = {}
+    while len(cores) < n_cores:
+        supplies = []
+        for _ in range(rng.randint(1, 4)):
+            P = rng.randint(2, 30)
+            supplies.append((rng.randint(1, P - 1), P))
+        if abs(sum(Q / P for Q, P in supplies) - parent_alpha) >= 0.02:
+            cores[f"Core_{len(cores)}"] = supplies
+    return cores
+
+
+@pytest.mark.parametrize("parent_alpha, parent_delta", [(1.0, 0), (1.0, 5), (0.8, 3), (0.5, 10)])
+def test_sweeps_match_dense_grid(parent_alpha, parent_delta):
+    rng = random.Random(int(parent_alpha * 100) + parent_delta)
+    cores = random_cores(rng, 60, parent_alpha)
+    for check, dense in (("bdr", dense_bdr), ("dbf", dense_dbf)):
+        got = compose.schedulable_cores(cores, check, parent_alpha, parent_delta)
+        expected = {c: dense(s, parent_alpha, parent_delta) for c, s in cores.items()}
+        assert got == expected, check
+
+
+def test_dbf_fallback_to_qpa_agrees(monkeypatch):
+    cores = random_cores(random.Random(3), 40, 1.0)
+    swept = compose.schedulable_cores(cores, "dbf", 1.0, 2)
+    monkeypatch.setattr(compose, "SWEEP_MAX_DEADLINES", 0)      # 每个核心都退回 dbf.qpa_edf
+    assert compose.schedulable_cores(cores, "dbf", 1.0, 2) == swept
+
+
+def test_dbf_full_utilization():
+    cores = {"Core_1": [(1, 2), (1, 4), (2, 8)]}               # Σ Q/P = 1
+    assert compose.schedulable_cores(cores, "dbf", 1.0, 0) == {"Core_1": True}
+    assert compose.schedulable_cores(cores, "dbf", 1.0, 1) == {"Core_1": False}
+
+
+def test_unknown_check_rejected():
+    with pytest.raises(ValueError):
+        compose.schedulable_cores({"Core_1": [(1, 2)]}, "peak")
@@ -0,0 +1,69 @@
+import math
+import random
+import numpy as np
+import pytest
+import dbf
+
+
+def test_dbf_curve_matches_direct_sum():
+    tasks = [(2, 5, 4), (1, 7, 7), (3, 12, 9)]
+    ts = np.arange(0, 120, dtype=float)
+    C, T, D = dbf.task_arrays(tasks)
+    expected = [sum(c * max(0, math.floor((t - d) / p) + 1) for c, p, d in tasks) for t in ts]
+    assert dbf.dbf_edf_curve(C, T, D, ts).tolist() == pytest.approx(expected)
+
+
+def test_rm_curve_is_max_over_priority_levels():
+    tasks = [(1, 4, 4), (2, 6, 6), (3, 10, 10)]          # 已按优先级高 → 低排列
+    ts = np.arange(0, 60, dtype=float)
+    C, T, D = dbf.task_arrays(tasks)
+    level = lambda t, i: sum(c * max(0, math.floor((t - d) / p) + 1) for c, p, d in tasks[:i + 1])
+    expected = [max(level(t, i) for i in range(len(tasks))) for t in ts]
+    assert dbf.dbf_rm_curve(C, T, D, ts).tolist() == pytest.approx(expected)
+
+
+def test_curve_is_chunked_without_changing_values(monkeypatch):
+    tasks = [(2, 5, 4), (1, 7, 7), (3, 12, 9)]
+    ts = np.arange(0, 500, dtype=float)
+    full = dbf.dbf_curve("EDF", tasks, ts)
+    monkeypatch.setattr(dbf, "CHUNK_ELEMS", 7)           # 每块只有 2 个测试点
+    assert dbf.dbf_curve("EDF", tasks, ts).tolist() == full.tolist()
+
+
+def brute_edf(tasks, alpha, delta, horizon):
+    """逐个截止期检查 dbf(t) ≤ α·max(0, t − Δ)，t 取 [0, horizon] 内的全部截止期 (整数参数，精确)。"""
+    deadlines = sorted({D + k * T for C, T, D in tasks for k in range((horizon - D) // T + 1)})
+    for t in deadlines:
+        demand = sum(C * ((t - D) // T + 1) for C, T, D in tasks if t >= D)
+        if demand > alpha * max(0, t - delta) + 1e-9:
+            return False
+    return True
+
+
+def random_case(rng):
+    n = rng.randint(1, 4)
+    tasks = []
+    for _ in range(n):
+        T = rng.randint(3, 20)
+        tasks.append((rng.randint(1, 4), T, rng.randint(max(1, T // 2), T)))
+    return tasks, rng.choice([0.3, 0.5, 0.7, 0.85, 1.0]), rng.choice([0, 0, 1, 3, 7])
+
+
+def test_qpa_matches_brute_force_deadline_scan():
+    rng = random.Random(7)
+    checked = 0
+    while checked < 300:
+        tasks, alpha, delta = random_case(rng)
+        U = sum(C / T for C, T, _ in tasks)
+        if abs(U - alpha) < 0.02:       # U ≈ α 时暴力扫描需要的时限过长，这里跳过
+            continue
+        # U < α：La ≤ (Σ U(T−D) + αΔ)/(α − U) ≤ 2000；U > α：dbf(t) ≥ U·t − ΣC 在 t ≈ 1000 之前就超过供给
+        assert dbf.qpa_edf(tasks, alpha, delta) == brute_edf(tasks, alpha, delta, 4000), (tasks, alpha, delta)
+        checked += 1
+
+
+def test_qpa_full_utilization_boundary():
+    tasks = [(1, 2, 2), (1, 4, 4), (1, 4, 4)]          # U = 1
+    assert dbf.qpa_edf(tasks, 1.0, 0)
+    assert not dbf.qpa_edf(tasks, 1.0, 1)
+    assert not dbf.qpa_edf(tasks, 0.99, 0)
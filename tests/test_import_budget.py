@@ -0,0 +1,19 @@
+import importlib.util
+import os
+import pytest
+
+# 预算表与测量方式都以 benchmark.py 为准 (python -X importtime，每次一个全新解释器)
+_spec = importlib.util.spec_from_file_location(
+    "benchmark", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark.py"))
+benchmark = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(benchmark)
+
+
+@pytest.mark.parametrize("module", list(benchmark.IMPORT_BUDGETS))
+def test_import_within_budget(module):
+    budget_ms, forbidden = benchmark.IMPORT_BUDGETS[module]
+    ms, heavy = benchmark.import_cost(module)
+    assert not [m for m in heavy if m in forbidden], heavy
+    if ms > budget_ms:                                  # 单核机器上偶有抖动，取两次中较快的一次
+        ms = min(ms, benchmark.import_cost(module)[0])
+    assert ms <= budget_ms, f"{module}: {ms:.1f} ms > {budget_ms} ms"
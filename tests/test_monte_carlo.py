@@ -0,0 +1,39 @@
+import pytest
+import monte_carlo as mc
+
+
+def test_percentile_takes_bucket_upper_bound():
+    hist = {100: 50, 200: 50}                       # 桶 [1.00, 1.01) 与 [2.00, 2.01)
+    assert mc._percentile(hist, 100, 0.50, 2.005) == pytest.approx(101 * mc.MC_HIST_WIDTH)
+
+
+def test_percentile_never_exceeds_observed_max():
+    hist = {100: 99, 250: 1}
+    rt_max = 250 * mc.MC_HIST_WIDTH + 0.001         # 最高桶内的真实最大值低于桶上界
+    assert mc._percentile(hist, 100, 0.99, rt_max) <= rt_max
+    assert mc._percentile(hist, 100, 1.00, rt_max) == rt_max
+
+
+def single_server(Q, P, C, T):
+    from model import Component, Core, SupplyTask, System, Task
+    comp = Component(component_id="A", scheduler="EDF", core_id="Core_1",
+                     tasks=[Task("A_T0", "A", "Core_1", float(C), float(T))])
+    system = System(cores={"Core_1": Core("Core_1", 1.0, "EDF")}, components={"A": comp})
+    return system, [SupplyTask("A", "Core_1", "EDF", float(Q), float(P), Q / P)]
+
+
+@pytest.mark.parametrize("dist", ["wcet", "uniform"])
+def test_overloaded_replicas_report_misses(dist):
+    # Q=1, P=2 每 4 TU 只供给 2 个单位，C ≥ 2.5 的 job 总是做不完
+    system, supplies = single_server(1, 2, 5, 4)
+    df = mc.monte_carlo(system, supplies, replicas=3, dist=dist, random_offsets=False)
+    row = df.iloc[0]
+    assert row["replica_miss_prob"] == 1.0
+    assert row["miss_ratio"] > 0.5
+    assert row["rt_max"] >= 4.0                         # 删失响应时间 ≥ D
+
+
+def test_feasible_replicas_report_no_misses():
+    system, supplies = single_server(1, 2, 1, 4)
+    df = mc.monte_carlo(system, supplies, replicas=3)
+    assert df.iloc[0]["replica_miss_prob"] == 0.0 and df.iloc[0]["miss_ratio"] == 0.0
@@ -0,0 +1,15 @@
+import config
+import pipeline
+import simulate_full_auto as sfa
+
+
+def test_case_key_tracks_simulator_semantics(tmp_path, monkeypatch):
+    case = tmp_path / "case"
+    case.mkdir()
+    for name in ("tasks.csv", "budgets.csv", "architecture.csv"):
+        (case / name).write_text("x\n")
+    paths = config.CasePaths(str(case), str(tmp_path / "out"))
+    key = pipeline.case_key(paths)
+    assert pipeline.case_key(paths) == key
+    monkeypatch.setattr(sfa, "SIM_SEMANTICS_VERSION", sfa.SIM_SEMANTICS_VERSION + 1)
+    assert pipeline.case_key(paths) != key                 # 仿真行为改动后旧的 solution 行不再命中
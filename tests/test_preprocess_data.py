@@ -0,0 +1,97 @@
+from dataclasses import asdict
+import pickle
+import pytest
+import config
+import preprocess_data as pp
+
+TASKS = """task_name,wcet,period,component_id,priority
+T0,1,10,A,
+T1,2,5,A,
+T2,1,10,A,
+T3,3,20,B,
+T4,2,15,B,1
+T5,1,8,C,
+"""
+BUDGETS = """component_id,scheduler,budget,period,core_id,priority
+A,RM,2,5,Core_1,
+B,EDF,3,10,Core_1,
+C,rm,1,4,Core_2,0
+"""
+ARCH = """core_id,speed_factor,scheduler
+Core_1,0.5,EDF
+Core_2,1.0,RM
+"""
+
+
+@pytest.fixture
+def paths(tmp_path):
+    case = tmp_path / "case"
+    case.mkdir()
+    for name, text in (("tasks.csv", TASKS), ("budgets.csv", BUDGETS), ("architecture.csv", ARCH)):
+        (case / name).write_text(text)
+    return config.CasePaths(str(case), str(tmp_path / "out"))
+
+
+def flat(system):
+    """比较用：LazyTasks 与普通列表统一成 dict。"""
+    return ({cid: (asdict(c) | {"tasks": [asdict(t) for t in c.tasks]}) for cid, c in system.components.items()},
+            {cid: asdict(c) for cid, c in system.cores.items()}, list(system.components))
+
+
+def test_build_system(paths):
+    system = pp.build_system(paths)
+    assert list(system.components) == ["A", "B", "C"]
+    a = system.components["A"]
+    assert a.scheduler == "RM" and a.alpha_budget == pytest.approx(0.4) and a.delta_budget == 3
+    assert [t.wcet for t in a.tasks] == [2.0, 4.0, 2.0]                # 按 speed_factor 0.5 折算
+    assert [t.priority for t in a.tasks] == [1, 0, 1]                  # RM 缺省优先级：周期密集秩
+    assert [t.priority for t in system.components["B"].tasks] == [None, 1]   # EDF 组件不补
+    assert system.components["C"].tasks[0].priority == 0 and system.components["C"].priority == 0
+
+
+def test_chunk_size_does_not_change_result(paths):
+    assert flat(pp.build_system(paths, chunk_rows=2)) == flat(pp.build_system(paths))
+
+
+def test_invalid_row_reports_line_number(paths):
+    with open(paths.tasks_path, "a") as f:
+        f.write("T6,-1,10,A,\n")
+    with pytest.raises(ValueError, match=r"wcet < 0: 第 \[8\] 行"):
+        pp.build_system(paths, chunk_rows=4)
+
+
+def test_npz_round_trip(paths):
+    system = pp.build_system(paths)
+    key = pp.inputs_digest(paths)
+    pp.write_npz(system, paths.preprocessed_npz_path, key)
+    loaded = pp.read_npz(paths.preprocessed_npz_path, key)
+    assert flat(loaded) == flat(system)
+    assert pp.read_npz(paths.preprocessed_npz_path, "stale") is None
+    # 组件可被 pickle 送进子进程 / 结果缓存，任务变成普通列表
+    comp = pickle.loads(pickle.dumps(pp.read_npz(paths.preprocessed_npz_path).components["A"]))
+    assert comp.tasks == system.components["A"].tasks
+
+
+def test_unreadable_npz_is_a_miss(paths, tmp_path):
+    bad = tmp_path / "bad.npz"
+    bad.write_bytes(b"not a zip")
+    assert pp.read_npz(str(bad)) is None
+    assert pp.read_npz(str(tmp_path / "missing.npz")) is None
+
+
+def test_load_system_uses_npz_until_inputs_change(paths, monkeypatch):
+    first = pp.load_system(paths)
+    build = pp.build_system
+    monkeypatch.setattr(pp, "build_system", lambda p: pytest.fail("输入未变却重新解析了 CSV"))
+    assert flat(pp.load_system(paths)) == flat(first)
+    with open(paths.tasks_path, "a") as f:
+        f.write("T6,1,10,A,\n")
+    monkeypatch.setattr(pp, "build_system", build)
+    assert len(pp.load_system(paths).components["A"].tasks) == 4
+
+
+def test_dense_rm_rank_per_component():
+    import numpy as np
+    code = np.array([1, 0, 1, 0, 1, 0])
+    period = np.array([20.0, 5.0, 10.0, 5.0, 20.0, 8.0])
+    assert pp.dense_rm_rank(code, period).tolist() == [1, 0, 0, 0, 1, 1]
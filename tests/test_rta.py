@@ -0,0 +1,63 @@
+import math
+import pytest
+import rta
+from model import Component, Task
+
+
+def test_fp_textbook_example():
+    # Liu & Layland 式例：(C, T) = (1, 4), (2, 6), (3, 12)，专用处理器
+    assert rta.rta_fp([(1, 4, 4), (2, 6, 6), (3, 12, 12)], 1.0, 0.0) == [1, 3, 10]
+
+
+@pytest.mark.parametrize("order", [(0, 1), (1, 0)])
+def test_fp_equal_priority_interferes_both_ways(order):
+    tasks = [(2, 10, 10), (2, 10, 10)]
+    wcrt = rta.rta_fp([tasks[i] for i in order], 1.0, 0.0, priorities=[0, 0])
+    assert wcrt == [4, 4]
+
+
+def test_fp_equal_priority_independent_of_input_order():
+    tasks = [(1, 5, 5), (2, 10, 10), (3, 10, 10)]
+    prios = [0, 1, 1]
+    fwd = rta.rta_fp(tasks, 1.0, 0.0, prios)
+    rev = rta.rta_fp(tasks[::-1], 1.0, 0.0, prios[::-1])
+    assert fwd == rev[::-1]
+    assert fwd[1] == fwd[2] == 7      # 1·⌈7/5⌉ + 2 + 3 = 7
+
+
+def test_fp_bdr_supply():
+    # sbf⁻¹(w) = Δ + w/α
+    assert rta.rta_fp([(1, 10, 10)], 0.5, 2.0) == [4.0]
+
+
+def test_fp_overload_is_inf():
+    assert math.isinf(rta.rta_fp([(3, 5, 5), (3, 5, 5)], 1.0, 0.0, [0, 0])[1])
+
+
+def make_component(scheduler, prios):
+    comp = Component("C", scheduler, "Core_1")
+    comp.tasks = [Task(f"T{i}", "C", "Core_1", C, T, p) for i, ((C, T), p) in enumerate(zip([(1, 4), (2, 6)], prios))]
+    return comp
+
+
+def test_component_rta_falls_back_to_edf_when_priorities_contradict_periods():
+    # 周期短的 T0 反而优先级低：analyzer 按 EDF 分析，RTA 也必须按 EDF，而不是照给定优先级做 FP
+    comp = make_component("RM", [1, 0])
+    assert comp.analysis_scheduler() == "EDF"
+    tasks = [(t.wcet, t.period, t.deadline) for t in comp.tasks]
+    got = [R for _, R in rta.component_rta(comp, 0.9, 1.0)]
+    assert got == rta.rta_edf(tasks, 0.9, 1.0)
+    assert got != rta.rta_fp(tasks, 0.9, 1.0, [1, 0])
+
+
+def test_component_rta_uses_fp_for_consistent_priorities():
+    comp = make_component("RM", [0, 1])
+    assert comp.analysis_scheduler() == "RM"
+    assert [R for _, R in rta.component_rta(comp, 1.0, 0.0)] == [1, 3]
+
+
+def test_analyzer_shares_the_rm_fallback():
+    import analyzer
+    edf = analyzer.analyze_component(make_component("EDF", [None, None]))
+    fallback = analyzer.analyze_component(make_component("RM", [1, 0]))
+    assert fallback[:3] == edf[:3]
@@ -0,0 +1,171 @@
+import pytest
+import simulate_full_auto as sfa
+from model import Component, Core, SupplyTask, System, Task
+
+
+def make_system(comps, core_sched="EDF"):
+    """comps: [(component_id, scheduler, Q, P, [(C, T, priority), ...])] → (System, supplies)，全部在 Core_1。"""
+    components, supplies = {}, []
+    for cid, sched, Q, P, tasks in comps:
+        comp = Component(component_id=cid, scheduler=sched, core_id="Core_1")
+        comp.tasks = [Task(f"{cid}_T{i}", cid, "Core_1", float(C), float(T), prio)
+                      for i, (C, T, prio) in enumerate(tasks)]
+        components[cid] = comp
+        supplies.append(SupplyTask(cid, "Core_1", sched, float(Q), float(P), Q / P))
+    return System(cores={"Core_1": Core("Core_1", 1.0, core_sched)}, components=components), supplies
+
+
+def run_one(comps, core_sched="EDF", **kw):
+    system, supplies = make_system(comps, core_sched)
+    components, cores = sfa.build_components(system, supplies, verbose=False)
+    sfa.run_core("Core_1", cores["Core_1"], **kw)
+    return components, cores["Core_1"]
+
+
+def test_unused_budget_expires_at_replenishment():
+    # Q=2, P=10, 任务 C=3, T=20：每个 job 在 [0,2) 与 [10,11) 执行，第二个周期剩 1 个单位预算。
+    # 周期资源模型下这 1 个单位在 t=20 作废，之后每个 job 的响应时间都是 11；
+    # 若预算累加，t=20 时预算为 3，后续 job 响应时间会缩短为 3。
+    components, core = run_one([("A", "EDF", 2, 10, [(3, 20, None)])])
+    task = components["A"].tasks[0]
+    assert task.rt_count > 1
+    assert task.rt_max == pytest.approx(11.0)
+    assert task.rt_sum / task.rt_count == pytest.approx(11.0)
+    assert components["A"].budget <= components["A"].Q + sfa.EPS
+
+
+def test_reset_budget_reaches_steady_state():
+    _, core = run_one([("A", "EDF", 2, 10, [(3, 20, None)])])
+    assert core["steady_state"]
+    assert core["sim_horizon"] == pytest.approx(2 * core["hyperperiod"])
+
+
+def tick_reference(comps, core_sched, horizon):
+    """逐 tick 的参考仿真 (整数参数，1 TU 一步)，调度规则与事件驱动版相同：
+    同一时刻先补预算、再释放任务；旧 job 未完成时记 miss 并按删失响应时间计入，再由新 job 覆盖；
+    核心层 EDF 取组件内最早截止期，RM 全部组件同优先级；组件内 EDF 取最早截止期，RM 取 priority；
+    平局按下标。返回每个任务的 (响应时间样本数, 响应时间和, 最大响应时间, miss 数)。"""
+    servers = [{"Q": Q, "P": P, "budget": 0, "sched": sched,
+                "tasks": [{"C": C, "T": T, "prio": prio, "release": 0, "deadline": 0, "rem": 0, "rts": [], "miss": 0}
+                          for C, T, prio in tasks]}
+               for _, sched, Q, P, tasks in comps]
+    for t in range(horizon):
+        for s in servers:
+            if t % s["P"] == 0:
+                s["budget"] = s["Q"]
+            for task in s["tasks"]:
+                if t % task["T"] == 0:
+                    if task["rem"] > 0:
+                        task["rts"].append(t - task["release"])
+                        task["miss"] += 1
+                    task.update(release=t, deadline=t + task["T"], rem=task["C"])
+        ready = []
+        for i, s in enumerate(servers):
+            pending = [task for task in s["tasks"] if task["rem"] > 0]
+            if s["budget"] > 0 and pending:
+                ready.append((min(task["deadline"] for task in pending) if core_sched == "EDF" else 0, i))
+        if not ready:
+            continue
+        s = servers[min(ready)[1]]
+        pending = [(task["deadline"] if s["sched"] == "EDF" else task["prio"], j)
+                   for j, task in enumerate(s["tasks"]) if task["rem"] > 0]
+        task = s["tasks"][min(pending)[1]]
+        task["rem"] -= 1
+        s["budget"] -= 1
+        if task["rem"] == 0:
+            task["rts"].append(t + 1 - task["release"])
+            task["miss"] += t + 1 > task["deadline"]
+    return [[(len(task["rts"]), sum(task["rts"]), max(task["rts"], default=0), task["miss"]) for task in s["tasks"]]
+            for s in servers]
+
+
+def random_core(rng):
+    comps = []
+    for c in range(rng.randint(1, 3)):
+        P = rng.choice([2, 3, 4, 6, 8, 12])
+        tasks = [(rng.randint(1, 3), rng.choice([4, 6, 8, 12, 24]), rng.randint(0, 3))
+                 for _ in range(rng.randint(1, 3))]
+        comps.append((f"C{c}", rng.choice(["EDF", "RM"]), rng.randint(1, P - 1), P, tasks))
+    return comps, rng.choice(["EDF", "RM"])
+
+
+def test_event_simulator_matches_tick_reference():
+    import random
+    rng = random.Random(11)
+    for _ in range(150):
+        comps, core_sched = random_core(rng)
+        system, supplies = make_system(comps, core_sched)
+        components, cores = sfa.build_components(system, supplies, verbose=False)
+        _, horizon, _, _ = sfa.simulate_core(cores["Core_1"])
+        got = [[(t.rt_count, t.rt_sum, t.rt_max, t.miss_cnt) for t in components[cid].tasks]
+               for cid, *_ in comps]
+        assert got == tick_reference(comps, core_sched, int(horizon)), (comps, core_sched)
+
+
+def test_ready_queue_orders_by_key_then_index_and_drops_stale_entries():
+    live = {0: 1, 1: 1, 2: 1}                           # idx → 当前有效的 stamp
+    q = sfa.ReadyQueue(lambda idx, stamp: live[idx] == stamp)
+    q.push(5.0, 2, 1)
+    q.push(5.0, 1, 1)
+    q.push(7.0, 0, 1)
+    assert q.peek() == (5.0, 1, 1)                      # key 相同按 idx 决胜
+    live[1] = 2                                         # 条目作废，不主动删除
+    assert q.peek() == (5.0, 2, 1)
+    live[2] = 0
+    assert q.peek() == (7.0, 0, 1)
+    live[0] = 0
+    assert q.peek() is None
+
+
+def test_core_scheduler_picks_by_two_level_keys():
+    # 核心层 EDF：B 的最早截止期 (6) 先于 A (10)；B 内部 RM 选 priority 最小的任务
+    system, supplies = make_system([("A", "EDF", 2, 4, [(1, 10, None)]),
+                                    ("B", "RM", 2, 4, [(1, 12, 1), (1, 6, 0)])])
+    components, cores = sfa.build_components(system, supplies, verbose=False)
+    comps = list(cores["Core_1"]["components"].values())
+    sched = sfa.CoreScheduler(cores["Core_1"], comps)
+    for ci, comp in enumerate(comps):
+        comp.budget = comp.Q
+        for ti, task in enumerate(comp.tasks):
+            task.release, task.deadline, task.remaining = 0.0, task.period, task.wcet
+            sched.release(ci, ti)
+        sched.refresh(ci)
+    ci, comp, task = sched.pick()
+    assert comp.component_id == "B" and task.name == "B_T1"
+    comp.budget = 0.0                                   # 预算耗尽 → 组件退出核心就绪堆
+    sched.refresh(ci)
+    assert sched.pick()[1].component_id == "A"
+
+
+def test_unfinished_job_is_a_miss_when_overwritten():
+    # Q=1, P=2 每个周期 T=4 内只供给 2 个单位，C=3 的 job 永远做不完：每次释放都覆盖一个未完成的 job
+    components, core = run_one([("A", "EDF", 1, 2, [(3, 4, None)])])
+    task = components["A"].tasks[0]
+    assert task.miss_cnt == task.job                    # 每个 job 都 miss (最后一个在时限末尾计入)
+    assert task.rt_count == task.job
+    assert task.rt_max == pytest.approx(4.0)            # 删失响应时间 ≥ D
+
+
+def test_release_calendar_with_large_scale_timebase():
+    # 素数分母的 Half-Half 周期 + 999/1000 的任务周期：scale ≈ 1.2e18，j · period 远超 int64
+    from fractions import Fraction
+    periods = [Fraction(100, d) for d in (97, 89, 83, 79, 73, 71, 67, 61)] + [Fraction(999, 1000)]
+    tb = sfa.timebase.TimeBase.of(periods)
+    assert tb.scale > 10**18
+    ticks = [tb.ticks(p) for p in periods]
+    counts = [sfa.math.ceil(2000 / p) for p in periods]
+    cal = sfa.ReleaseCalendar(ticks, counts, scale=tb.scale)
+    window = cal.window(0)
+    exact = sorted((float(m * p), i) for i, p in enumerate(periods) for m in range(counts[i]))
+    assert [t for t, _ in window] == [t for t, _ in exact]
+    assert window == sorted(window)
+
+
+def test_large_scale_core_simulates_in_order():
+    comps = [(f"C{i}", "EDF", 12 / d, 100 / d, [(0.01, 0.999, None)])
+             for i, d in enumerate((97, 89, 83, 79, 73, 71, 67, 61))]
+    components, core = run_one(comps, max_time=2000)
+    for comp in components.values():
+        task = comp.tasks[0]
+        assert task.miss_cnt == 0
+        assert task.rt_max < 0.999
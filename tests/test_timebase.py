@@ -0,0 +1,31 @@
+from fractions import Fraction
+import pytest
+import timebase
+
+
+def test_as_fraction_recovers_simple_fractions_from_floats():
+    assert timebase.as_fraction(0.1) == Fraction(1, 10)
+    assert timebase.as_fraction(0.1 + 0.2) == Fraction(3, 10)      # 0.30000000000000004
+    assert timebase.as_fraction(500 / 63) == Fraction(500, 63)
+    assert timebase.as_fraction(Fraction(7, 3)) == Fraction(7, 3)
+
+
+def test_hyperperiod_of_rational_periods():
+    assert timebase.hyperperiod([4, 6, 10]) == 60
+    assert timebase.hyperperiod([2.5, 4]) == 20
+    assert timebase.hyperperiod([0.1 * 3, 0.2]) == Fraction(3, 5)
+    assert timebase.hyperperiod([500 / 63, 10]) == 500
+
+
+def test_ticks_are_exact_integers():
+    tb = timebase.TimeBase.of([0.5, 1 / 3, 2])
+    assert tb.scale == 6
+    assert tb.ticks(1 / 3) == 2
+    assert tb.ticks(0.1 * 3 * 10) == 18                          # 2.9999999999999996 → 3 TU
+    assert tb.time(3) == 0.5
+    assert tb.ceil(7) == 2 and tb.ceil(6) == 1
+
+
+def test_ticks_reject_values_outside_the_timebase():
+    with pytest.raises(ValueError):
+        timebase.TimeBase.of([0.5]).ticks(1 / 3)